@@ -1,128 +1,1351 @@
+import os
+import sys
+import shutil
+import signal
+import socket
+import asyncio
+import json
+import dataclasses
 import dagshub
 import uvicorn
-import pandas as pd
+import numpy as np
 import time  # Added for high-resolution timing
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+IMPORT_START = time.perf_counter()
+from pathlib import Path
+from typing import List, Optional
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
 from contextlib import asynccontextmanager
+from customerSatisfaction.config.configuration import ConfigurationManager
+from customerSatisfaction.components.micro_batcher import MicroBatcher
+from customerSatisfaction.components.admission_control import AdmissionController, AdmissionRejected
+from customerSatisfaction.components.at_risk_queue import AtRiskQueue, SharedAtRiskQueue, rank
+from customerSatisfaction.components.inference_executor import InferenceExecutor
+from customerSatisfaction.components.prediction_cache import PredictionCache
+from customerSatisfaction.components.prediction_log import PredictionLogger
+from customerSatisfaction.components.reload_marker import ReloadMarker
+from customerSatisfaction.components.model_bundle import (
+    MODEL_BUNDLE_ENV, explained_classifier, export_model_bundle, is_array_bundle, load_model_bundle,
+    load_serving_pipeline
+)
+from customerSatisfaction.components.model_cache import ModelCache
+from customerSatisfaction.components.phase_timer import PhaseTimer, PhaseTimingMiddleware
+from customerSatisfaction.components.columnar_codec import (
+    ColumnarCodec, ColumnarValidationError, UnsupportedFormatError, media_type
+)
+from customerSatisfaction.components.decision_policy import DecisionPolicy
+from customerSatisfaction.components.drift_monitor import DriftMonitor, load_reference
+from customerSatisfaction.components.risk_window import RiskWindow
+from customerSatisfaction.components.shadow_scorer import ShadowScorer
+from customerSatisfaction.components.thread_budget import ThreadBudget
+from customerSatisfaction.components.tree_explainer import TreeExplainer, UnsupportedModelError
+from customerSatisfaction.components.response_encoder import ResponseEncoder, build_results, dumps
+from customerSatisfaction.components.stream_reader import CSV, NDJSON, DuplexStreamingResponse, StreamReader
 from customerSatisfaction.pipeline.prediction import PredictionPipeline
-from customerSatisfaction import logger
+from customerSatisfaction.utils.logging_setup import dropped_records, on_dropped_record
+from customerSatisfaction import log_listener, logger
 from prometheus_fastapi_instrumentator import Instrumentator
-from prometheus_client import Counter, Histogram  # Added Histogram for Alarms
+from prometheus_client import Counter, Gauge, Histogram, multiprocess  # Added Histogram for Alarms
 
 # --- 1. INITIALIZATION ---
-try:
-    dagshub.init(
-        repo_owner='Onabanjomicheal', 
-        repo_name='Customer_Satisfaction_Prediction_to_Production', 
-        mlflow=True
-    )
-except Exception as e:
-    logger.error(f"DagsHub failed: {e}")
+def init_registry():
+    try:
+        dagshub.init(
+            repo_owner='Onabanjomicheal', 
+            repo_name='Customer_Satisfaction_Prediction_to_Production', 
+            mlflow=True
+        )
+    except Exception as e:
+        logger.error(f"DagsHub failed: {e}")
+
+# Resolved in the background by the lifespan so the server binds immediately;
+# routes answer 503 until it is loaded and warmed up
+predictor = None
+# Set by the serving parent when the model is bundled whole: its workers are forked from it
+PREFORK_ENV = "SERVING_PREFORK"
+# Loaded once by serve_preforked before forking; workers start from it instead of loading their own
+preloaded_pipeline = None
+# Under serving.model_bundle_dir, shared by every worker
+RELOAD_MARKER_FILE = "reloads.json"
+config_manager = ConfigurationManager()
+micro_batching_config = config_manager.get_micro_batching_config()
+inference_executor_config = config_manager.get_inference_executor_config()
+prediction_cache_config = config_manager.get_prediction_cache_config()
+serving_config = config_manager.get_serving_config()
+model_reload_config = config_manager.get_model_reload_config()
+streaming_config = config_manager.get_streaming_config()
+columnar_codec = ColumnarCodec(config_manager.get_columnar_batch_config())
+response_encoding_config = config_manager.get_response_encoding_config()
+admission_control_config = config_manager.get_admission_control_config()
+explanation_config = config_manager.get_explanation_config()
+shadow_config = config_manager.get_shadow_config()
+risk_window_config = config_manager.get_risk_window_config()
+at_risk_queue_config = config_manager.get_at_risk_queue_config()
+drift_monitor_config = config_manager.get_drift_monitor_config()
+prediction_log_config = config_manager.get_prediction_log_config()
+inference_timing_config = config_manager.get_inference_timing_config()
 
-predictor = PredictionPipeline()
+# One core budget for uvicorn workers x executor threads x BLAS/model threads per call
+thread_allocation = None
+thread_budget_config = config_manager.get_thread_budget_config()
+if thread_budget_config.enabled:
+    thread_allocation = ThreadBudget(thread_budget_config).for_serving(
+        workers=int(os.environ.get("WEB_CONCURRENCY", serving_config.workers)),
+        executor_workers=inference_executor_config.max_workers if inference_executor_config.enabled else 1
+    )
+    ThreadBudget.apply(thread_allocation, "serving")
+    inference_executor_config = dataclasses.replace(
+        inference_executor_config, max_workers=thread_allocation.executor_threads
+    )
+# Tier thresholds from params.yaml; swapped by POST /admin/policy/reload
+policy = DecisionPolicy(config_manager.get_decision_policy_config())
 
 # --- ALARM SYSTEM DATA POINTS ---
 PREDICTION_COUNT = Counter("predictions_total", "Predictions by result", ["result"])
 
-# This allows an alarm to trigger if P95 latency > 500ms
+# This allows an alarm to trigger if P95 latency > 500ms. Single-order /predict only:
+# whole batches and stream chunks go to BATCH_LATENCY so they can't trip the alarm
 MODEL_LATENCY = Histogram(
     "model_prediction_duration_seconds",
-    "Inference latency distribution",
-    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+    "Single-order inference latency distribution",
+    buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
 )
 
 # This allows an alarm to trigger if error rates spike
 PREDICTION_ERRORS = Counter("prediction_errors_total", "Total count of failed inferences")
 
+# Admission control: overload is shed before scoring, so it never counts as a prediction error
+ADMISSION_IN_FLIGHT = Gauge(
+    "inference_requests_in_flight",
+    "Admitted scoring requests currently running",
+    multiprocess_mode="livesum"
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "inference_admission_queue_depth",
+    "Scoring requests waiting for an admission slot",
+    multiprocess_mode="livesum"
+)
+REQUESTS_SHED = Counter("inference_requests_shed_total", "Requests rejected because the admission queue was full")
+DEADLINE_EXCEEDED = Counter(
+    "inference_deadline_exceeded_total",
+    "Requests rejected after waiting longer than the admission deadline"
+)
+
+# Batch scoring: how many rows per call and what each row costs once amortized
+BATCH_SIZE = Histogram(
+    "batch_prediction_size",
+    "Rows scored per /predict/batch call",
+    buckets=[1, 10, 50, 100, 500, 1000, 5000, 10000]
+)
+BATCH_ROW_LATENCY = Histogram(
+    "batch_prediction_row_duration_seconds",
+    "Batch inference latency amortized per row",
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1]
+)
+BATCH_LATENCY = Histogram(
+    "batch_prediction_duration_seconds",
+    "Whole-call inference latency of multi-row scoring",
+    ["kind"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0]
+)
+
+# Micro-batching: how long single /predict calls queue and how many get coalesced
+MICRO_BATCH_QUEUE_DEPTH = Gauge(
+    "micro_batch_queue_depth",
+    "Single-row requests waiting to be batched",
+    multiprocess_mode="livesum"
+)
+MICRO_BATCH_SIZE = Histogram(
+    "micro_batch_size",
+    "Rows scored per coalesced /predict flush",
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128]
+)
+MICRO_BATCH_WAIT = Histogram(
+    "micro_batch_wait_seconds",
+    "Queueing delay added by micro-batching",
+    buckets=[0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.05]
+)
+
+# Inference executor: time waiting for a free worker vs time inside predict_proba
+EXECUTOR_QUEUE_TIME = Histogram(
+    "inference_executor_queue_seconds",
+    "Time scoring tasks wait for a free executor worker",
+    buckets=[0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5]
+)
+EXECUTOR_COMPUTE_TIME = Histogram(
+    "inference_executor_compute_seconds",
+    "Time spent scoring inside an executor worker",
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0]
+)
+
+# Prediction cache: repeated order payloads served without re-scoring
+CACHE_EVENTS = {
+    "hit": Counter("prediction_cache_hits_total", "Predictions served from the cache"),
+    "miss": Counter("prediction_cache_misses_total", "Predictions that required inference"),
+    "eviction": Counter("prediction_cache_evictions_total", "Entries evicted by size or TTL"),
+    "invalidation": Counter("prediction_cache_invalidations_total", "Cache flushes caused by a model version change"),
+}
+
+# Model cascade: rows the first-stage model settled vs rows escalated to the champion
+CASCADE_ROWS = Counter("cascade_rows_total", "Rows scored by a cascade model")
+CASCADE_ESCALATIONS = Counter("cascade_escalations_total", "Cascade rows escalated to the champion model")
+
+# Startup: where cold-start time goes (import, registry, model load, warmup)
+STARTUP_PHASE_SECONDS = Gauge(
+    "startup_phase_duration_seconds",
+    "Duration of each backend startup phase",
+    ["phase"]
+)
+
+# Hot reload: which model is live and what each swap cost
+MODEL_INFO = Gauge(
+    "model_version_info",
+    "Currently served model (value is always 1)",
+    ["version", "source"],
+    multiprocess_mode="liveall"
+)
+MODEL_RELOAD_SECONDS = Histogram(
+    "model_reload_duration_seconds",
+    "Time to load, warm up, validate and swap in a new model",
+    buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+)
+MODEL_RELOADS = Counter("model_reloads_total", "Model reload attempts by outcome", ["outcome"])
+
+# Streaming bulk scoring: volume and per-chunk throughput of /predict/stream
+STREAM_ROWS = Counter("stream_rows_processed_total", "Rows read from /predict/stream bodies", ["status"])
+STREAM_CHUNK_THROUGHPUT = Histogram(
+    "stream_chunk_rows_per_second",
+    "Scoring throughput of each /predict/stream chunk",
+    buckets=[100, 500, 1000, 5000, 10000, 50000, 100000, 500000]
+)
+
+# Columnar batch scoring: request decode + vectorized validation time
+COLUMNAR_DECODE_LATENCY = Histogram(
+    "columnar_batch_decode_duration_seconds",
+    "Decode and validation time of Arrow / msgpack batch bodies",
+    ["format"],
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5]
+)
+
+# Explanations: timed apart from /predict so expensive batches don't skew its alarms
+EXPLANATION_LATENCY = Histogram(
+    "explanation_duration_seconds",
+    "End-to-end latency of /explain calls",
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+)
+EXPLANATION_CACHE_EVENTS = Counter(
+    "explanation_cache_events_total",
+    "Explanation cache hits, misses, evictions and invalidations",
+    ["event"]
+)
+EXPLANATION_ERRORS = Counter("explanation_errors_total", "Total count of failed /explain calls")
+
+# Shadow scoring: how a challenger compares with the champion on sampled live traffic
+SHADOW_ROWS = Counter(
+    "shadow_rows_total",
+    "Rows scored by the challenger, by class agreement with the champion",
+    ["outcome"]
+)
+SHADOW_PROBABILITY_DELTA = Histogram(
+    "shadow_probability_delta",
+    "Challenger minus champion P(Satisfied) per shadowed row",
+    buckets=[-0.5, -0.2, -0.1, -0.05, -0.01, 0.01, 0.05, 0.1, 0.2, 0.5]
+)
+SHADOW_LATENCY = Histogram(
+    "shadow_challenger_duration_seconds",
+    "Challenger scoring time per shadow batch",
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+)
+SHADOW_DROPPED = Counter("shadow_rows_dropped_total", "Sampled rows dropped because the shadow queue was full")
+
+# Feature drift against the Stage 04 reference, per worker's share of traffic
+FEATURE_DRIFT_PSI = Gauge(
+    "feature_drift_psi",
+    "Population stability index of live vs training distribution",
+    ["feature"],
+    multiprocess_mode="liveall"
+)
+FEATURE_DRIFT_DISTANCE = Gauge(
+    "feature_drift_distance",
+    "Binned KS statistic (numeric) or total variation distance (categorical) of live vs training distribution",
+    ["feature"],
+    multiprocess_mode="liveall"
+)
+FEATURE_DRIFT_WINDOW_ROWS = Gauge(
+    "feature_drift_window_rows",
+    "Decayed number of live rows behind the latest drift scores",
+    multiprocess_mode="liveall"
+)
+
+# Prediction log: rows persisted for retraining, and rows shed instead of blocking requests
+PREDICTION_LOG_ROWS = Counter("prediction_log_rows_total", "Scored rows sent to the prediction log", ["outcome"])
+PREDICTION_LOG_FLUSH = Histogram(
+    "prediction_log_flush_duration_seconds",
+    "Time to write one prediction log Parquet file",
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+)
+
+# Queue-mode logging drops records rather than block when the listener falls behind
+LOG_RECORDS_DROPPED = Counter("log_records_dropped_total", "Log records dropped because the logging queue was full")
+LOG_RECORDS_DROPPED.inc(dropped_records())
+on_dropped_record(LOG_RECORDS_DROPPED.inc)
+
+# Inference phases: where a prediction's time goes, from body parsing to response serialization
+INFERENCE_PHASE_LATENCY = Histogram(
+    "inference_phase_duration_seconds",
+    "Time spent in each inference phase (parse, frame, preprocess, classifier, decision, serialize)",
+    ["phase"],
+    buckets=[
+        0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+        0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+    ]
+)
+
+# Thread budget: the effective split of cores this worker started with
+THREAD_ALLOCATION = Gauge(
+    "thread_budget_allocation",
+    "Cores, workers and threads assigned by the thread budget",
+    ["consumer"],
+    multiprocess_mode="liveall"
+)
+if thread_allocation is not None:
+    for consumer, threads in thread_allocation.as_dict().items():
+        THREAD_ALLOCATION.labels(consumer=consumer).set(threads)
+
 # --- 2. SCHEMA ---
 class CustomerData(BaseModel):
+    # Same checks as schema.yaml inference_validation, which the columnar route applies per column
+    model_config = ConfigDict(allow_inf_nan=False)
+
     carrier_handling_time: float
     delivery_time_days: float
-    order_items_count: float
-    payment_value: float
+    order_items_count: float = Field(ge=0)
+    payment_value: float = Field(ge=0)
     estimated_delivery_days: float
-    avg_item_price: float
-    product_photos_qty: float
-    is_weekend_order: int
-    order_hour: int
-    product_description_lenght: float 
-    total_freight: float
-    total_price: float
-    is_late_delivery: int
-    used_installments: float
-    payment_installments: float
-    order_month: int
-    order_day_of_week: int
+    avg_item_price: float = Field(ge=0)
+    product_photos_qty: float = Field(ge=0)
+    is_weekend_order: int = Field(ge=0, le=1)
+    order_hour: int = Field(ge=0, le=23)
+    product_description_lenght: float = Field(ge=0)
+    total_freight: float = Field(ge=0)
+    total_price: float = Field(ge=0)
+    is_late_delivery: int = Field(ge=0, le=1)
+    used_installments: float = Field(ge=0, le=1)
+    payment_installments: float = Field(ge=0)
+    order_month: int = Field(ge=1, le=12)
+    order_day_of_week: int = Field(ge=0, le=6)
     product_category_name: str
     payment_type: str
     customer_state: str
+    # Not a model feature; orders sent with an id can enter the at-risk queue
+    order_id: Optional[str] = None
+
+    @field_validator("order_id", mode="before")
+    @classmethod
+    def order_id_as_str(cls, value):
+        return None if value is None else str(value)
+
+    def features(self) -> dict:
+        """Model input fields only."""
+        return self.model_dump(exclude={"order_id"})
 
 # --- 3. APP & MONITORING ---
-app = FastAPI(title="Customer Satisfaction Intelligence API")
+def score_records(records: List[dict]):
+    """Scores raw records in one call and returns P(Satisfied) per row."""
+    return predictor.predict_records(records)[:, 1]
+
+def score_columns(columns: dict):
+    """Scores a validated {feature: column} batch and returns P(Satisfied) per row."""
+    return predictor.predict_columns(columns)[:, 1]
+
+def record_executor_task(queue_s: float, compute_s: float):
+    EXECUTOR_QUEUE_TIME.observe(queue_s)
+    EXECUTOR_COMPUTE_TIME.observe(compute_s)
+
+executor = InferenceExecutor(
+    inference_executor_config, score_records,
+    on_complete=record_executor_task, score_columns_fn=score_columns
+) if inference_executor_config.enabled else None
+
+async def score_records_async(records: List[dict]):
+    """Scores raw records without blocking the event loop when the executor is enabled."""
+    if executor is not None:
+        return await executor.run(records)
+    return score_records(records)
+
+async def explain_records_async(pipeline, records: List[dict]) -> List[dict]:
+    """explain_records on the executor (process workers explain with their own model), else off the loop."""
+    if executor is not None:
+        return await executor.run_with_pipeline(explain_records, pipeline, records)
+    return await asyncio.to_thread(explain_records, pipeline, records)
+
+async def score_columns_async(columns: dict):
+    """score_columns, on the executor when it is enabled."""
+    if executor is not None:
+        return await executor.run(columns)
+    return score_columns(columns)
+
+def record_micro_batch(batch_size: int, waits: List[float]):
+    MICRO_BATCH_QUEUE_DEPTH.set(batcher.qsize())
+    MICRO_BATCH_SIZE.observe(batch_size)
+    for wait in waits:
+        MICRO_BATCH_WAIT.observe(wait)
+
+batcher = MicroBatcher(micro_batching_config, score_records_async, on_flush=record_micro_batch) \
+    if micro_batching_config.enabled else None
+
+def record_admission(in_flight: int, waiting: int):
+    ADMISSION_IN_FLIGHT.set(in_flight)
+    ADMISSION_QUEUE_DEPTH.set(waiting)
+
+admission = AdmissionController(
+    admission_control_config,
+    on_shed=lambda reason: (REQUESTS_SHED if reason == "queue_full" else DEADLINE_EXCEEDED).inc(),
+    on_occupancy=record_admission
+) if admission_control_config.enabled else None
+
+async def admit(fn):
+    """Awaits fn() under admission control; sheds with 503/429 + Retry-After when saturated."""
+    if admission is None:
+        return await fn()
+    try:
+        return await admission.run(fn)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=admission_control_config.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(admission_control_config.retry_after_seconds)}
+        )
+
+cache = PredictionCache(prediction_cache_config, on_event=lambda event: CACHE_EVENTS[event].inc()) \
+    if prediction_cache_config.enabled else None
+
+def record_shadow(champion: np.ndarray, challenger: np.ndarray, elapsed: float):
+    agree = policy.classify(1 - champion) == policy.classify(1 - challenger)
+    SHADOW_ROWS.labels(outcome="agree").inc(int(agree.sum()))
+    SHADOW_ROWS.labels(outcome="disagree").inc(int(len(agree) - agree.sum()))
+    for delta in (challenger - champion).tolist():
+        SHADOW_PROBABILITY_DELTA.observe(delta)
+    SHADOW_LATENCY.observe(elapsed)
+
+# Challenger calls share the thread executor's bounded, budgeted pool. Process workers only hold
+# the champion, so the shadow scorer then uses its own single thread
+shadow = ShadowScorer(
+    shadow_config, on_compare=record_shadow, on_drop=SHADOW_DROPPED.inc,
+    run_in=executor.run_with_pipeline if executor is not None and executor.config.kind == "thread" else None
+) if shadow_config.enabled else None
+
+# Rolling at-risk share per segment for GET /stats/risk; per process, like the other in-memory state
+risk_window = RiskWindow(risk_window_config) if risk_window_config.enabled else None
+
+def record_risk(records: List[dict], sat_probs):
+    """Adds scored orders to the risk windows; at risk means the tier's alert_color is risk_window.alert_color."""
+    if risk_window is None:
+        return
+    segments = {segment: [record[segment] for record in records] for segment in risk_window_config.segments}
+    record_risk_columns(segments, sat_probs)
+
+def record_risk_columns(columns: dict, sat_probs):
+    if risk_window is None:
+        return
+    sat_probs = np.asarray(sat_probs, dtype=np.float64)
+    # Tier lookup only: not part of the response, so not timed as its decision phase
+    tier = policy.interpretation.lookup(sat_probs)
+    at_risk = policy.interpretation.columns["alert_color"][tier] == risk_window_config.alert_color
+    risk_window.record(columns, 1.0 - sat_probs, at_risk)
+
+# Highest-churn open orders for GET /queue/at-risk. Unlike the risk windows it is shared
+# between serving workers, so a listing or a resolve doesn't depend on which one answers
+at_risk_queue = None
+if at_risk_queue_config.enabled:
+    at_risk_queue = AtRiskQueue(at_risk_queue_config)
+    if os.environ.get(MODEL_BUNDLE_ENV):
+        at_risk_queue = SharedAtRiskQueue(
+            at_risk_queue, at_risk_queue_config.shared_dir, at_risk_queue_config.sync_interval_seconds
+        )
+
+def queue_at_risk(order_ids: List[Optional[str]], records: List[dict], sat_probs):
+    """Queues or re-scores every order that came with an order_id."""
+    if at_risk_queue is None:
+        return
+    for order_id, record, sat_prob in zip(order_ids, records, np.asarray(sat_probs).tolist()):
+        if order_id is not None:
+            details = {segment: record[segment] for segment in at_risk_queue_config.segments}
+            at_risk_queue.update(order_id, 1.0 - sat_prob, {**details, "model_version": predictor.model_version})
+
+def record_drift(scores: dict, rows: float):
+    for feature, score in scores.items():
+        FEATURE_DRIFT_PSI.labels(feature=feature).set(score["psi"])
+        FEATURE_DRIFT_DISTANCE.labels(feature=feature).set(score["distance"])
+    FEATURE_DRIFT_WINDOW_ROWS.set(rows)
+
+def load_drift_monitor() -> Optional[DriftMonitor]:
+    if not drift_monitor_config.enabled:
+        return None
+    try:
+        reference = load_reference(drift_monitor_config.reference_path)
+    except Exception as e:
+        logger.warning(f"Drift monitoring disabled, no reference at {drift_monitor_config.reference_path}: {e}")
+        return None
+    return DriftMonitor(drift_monitor_config, reference, on_publish=record_drift)
+
+drift_monitor = load_drift_monitor()
+
+async def publish_drift():
+    """Exports drift scores every publish_interval_seconds."""
+    while True:
+        await asyncio.sleep(drift_monitor_config.publish_interval_seconds)
+        try:
+            drift_monitor.publish()
+        except Exception as e:
+            logger.warning(f"Drift publish failed: {e}")
+
+prediction_log = PredictionLogger(
+    prediction_log_config,
+    on_rows=lambda outcome, rows: PREDICTION_LOG_ROWS.labels(outcome=outcome).inc(rows),
+    on_flush=lambda rows, elapsed: PREDICTION_LOG_FLUSH.observe(elapsed)
+) if prediction_log_config.enabled else None
+
+def log_predictions(payload, sat_probs, order_ids=None):
+    """Hands scored rows to the prediction log; never waits on disk."""
+    if prediction_log is not None:
+        prediction_log.log(payload, sat_probs, order_ids, predictor.model_version)
+
+phase_timer = PhaseTimer(
+    inference_timing_config,
+    on_phase=lambda phase, seconds: INFERENCE_PHASE_LATENCY.labels(phase=phase).observe(seconds)
+) if inference_timing_config.enabled else None
+if phase_timer is not None:
+    policy.on_phase = phase_timer.record
+
+def enter_phase(phase: Optional[str]):
+    """Closes the request's open timing phase (parsing, initially) and opens `phase`."""
+    if phase_timer is not None:
+        phase_timer.enter(phase)
+
+explanation_cache = PredictionCache(
+    explanation_config.cache, on_event=lambda event: EXPLANATION_CACHE_EVENTS.labels(event=event).inc()
+) if explanation_config.cache.enabled else None
+
+# (pipeline, TreeExplainer) for the model that was live when it was built
+explainer = (None, None)
+
+def explainer_for(pipeline) -> TreeExplainer:
+    global explainer
+    if explainer[0] is not pipeline:
+        if pipeline.compiled is None:
+            raise UnsupportedModelError("Explanations need the compiled transformer fast path")
+        explainer = (pipeline, TreeExplainer(explained_classifier(pipeline), pipeline.compiled))
+    return explainer[1]
+
+def explain_records(pipeline, records: List[dict]) -> List[dict]:
+    """Vectorized per-feature contributions for a batch, one response entry per record."""
+    tree_explainer = explainer_for(pipeline)
+    contributions, base = tree_explainer.explain(pipeline.compiled.transform_records(records))
+    names = tree_explainer.feature_names
+    top_k = explanation_config.top_k
+
+    results = []
+    for row, (values, base_value) in enumerate(zip(contributions.tolist(), base.tolist())):
+        order = np.argsort(np.abs(contributions[row]))[::-1]
+        results.append({
+            "units": tree_explainer.units,
+            "base_value": round(base_value, 4),
+            "output": round(base_value + sum(values), 4),
+            "contributions": {names[i]: round(values[i], 4) for i in order},
+            # Most negative first: what pushes this order toward "Unsatisfied"
+            "risk_drivers": [names[i] for i in np.argsort(contributions[row])[:top_k] if values[i] < 0]
+        })
+    return results
+
+async def score_one(record: dict) -> float:
+    """Scores a single record through the micro-batcher when enabled."""
+    if batcher is not None:
+        # Coalesced with concurrent calls into one vectorized predict_proba
+        MICRO_BATCH_QUEUE_DEPTH.set(batcher.qsize() + 1)
+        return await batcher.submit(record)
+    return float((await score_records_async([record]))[0])
+
+def timed_phase(phase: str, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    STARTUP_PHASE_SECONDS.labels(phase=phase).set(time.perf_counter() - start)
+    logger.info(f"Startup phase '{phase}' took {time.perf_counter() - start:.3f}s")
+    return result
+
+def warm_up(pipeline):
+    """Primes the single-row and batch code paths before taking traffic."""
+    records = pipeline.sample_records()
+    pipeline.predict_records(records[:1])
+    pipeline.predict_records(records)
+
+def load_predictor():
+    """Blocking model resolution, run off the event loop."""
+    if preloaded_pipeline is not None:
+        pipeline = preloaded_pipeline
+    else:
+        # Workers mapping the shared bundle never touch the registry
+        if not os.environ.get(MODEL_BUNDLE_ENV):
+            timed_phase("registry_init", init_registry)
+        pipeline = timed_phase("model_load", load_serving_pipeline)
+    timed_phase("warmup", warm_up, pipeline)
+    return pipeline
+
+def record_cascade(rows: int, escalated: int):
+    CASCADE_ROWS.inc(rows)
+    CASCADE_ESCALATIONS.inc(escalated)
+
+# (version, source) this worker last reported in MODEL_INFO
+model_info_labels: List[tuple] = []
+
+def activate(pipeline):
+    """Atomically points every route at `pipeline`; calls already scoring keep the old object."""
+    global predictor
+    # Process executor workers score their own copy, so only in-process scoring reports here
+    pipeline.on_cascade = record_cascade
+    pipeline.on_phase = phase_timer.record if phase_timer is not None else None
+    predictor = pipeline
+    # clear() is a no-op for multiprocess gauges: zero the previous version's series instead
+    labels = (pipeline.model_version, pipeline.model_source)
+    if model_info_labels and model_info_labels[0] != labels:
+        MODEL_INFO.labels(*model_info_labels[0]).set(0)
+    MODEL_INFO.labels(*labels).set(1)
+    model_info_labels[:] = [labels]
+
+async def prime_executor(pipeline):
+    """Starts and warms every executor worker on `pipeline`'s sample rows before it takes traffic."""
+    if executor is not None:
+        await executor.prime(pipeline.sample_records())
+
+async def resolve_model():
+    try:
+        pipeline = await asyncio.to_thread(load_predictor)
+        start = time.perf_counter()
+        await prime_executor(pipeline)
+        STARTUP_PHASE_SECONDS.labels(phase="executor_warmup").set(time.perf_counter() - start)
+        activate(pipeline)
+        STARTUP_PHASE_SECONDS.labels(phase="total").set(time.perf_counter() - IMPORT_START)
+        logger.info(f"Model {predictor.model_version} ready to serve")
+    except Exception:
+        logger.exception("Model resolution failed, /health/ready will keep reporting 503")
+        return
+    if shadow is not None:
+        await resolve_challenger()
+
+async def resolve_challenger():
+    """Loads the shadow challenger once the champion is already serving."""
+    try:
+        challenger = await asyncio.to_thread(PredictionPipeline, shadow_config.challenger_stage)
+        if challenger.model_version == predictor.model_version:
+            logger.warning(f"Challenger {challenger.model_version} is the champion, shadow scoring stays off")
+            return
+        await asyncio.to_thread(validate_candidate, challenger, predictor)
+        shadow.challenger = challenger
+        logger.info(f"Shadow scoring {challenger.model_version} against {predictor.model_version}")
+    except Exception:
+        logger.exception("Challenger load failed, shadow scoring stays off")
+
+def validate_candidate(candidate, current):
+    """Rejects a reload whose inputs or outputs don't line up with the live model."""
+    if candidate.feature_signature() != current.feature_signature():
+        raise ValueError("Candidate model expects different input features")
+    records = current.sample_records()
+    probs = candidate.predict_records(records)
+    if probs.shape != current.predict_records(records).shape:
+        raise ValueError(f"Candidate output shape {probs.shape} does not match the live model")
+    if not np.all(np.isfinite(probs)) or not np.allclose(probs.sum(axis=1), 1.0, atol=1e-6):
+        raise ValueError("Candidate model returned invalid probabilities")
+
+reload_lock = asyncio.Lock()
+
+# With several serving workers, a reload one of them receives is published here for the others
+reload_marker = ReloadMarker(serving_config.model_bundle_dir / RELOAD_MARKER_FILE) \
+    if os.environ.get(MODEL_BUNDLE_ENV) else None
+# Last generation of each reload kind this worker applied
+seen_reloads = {"model": 0, "policy": 0}
+
+async def reload_model(force: bool = False) -> dict:
+    """Loads the current registry model in the background, validates it and swaps it in."""
+    async with reload_lock:
+        start = time.perf_counter()
+        current = predictor
+        try:
+            # Always resolve fresh: workers' shared bundle would hand back the old model. Pinning the
+            # stage disables the local-artifact fallback, so a registry failure rejects the reload
+            # instead of swapping the champion for a stale local model
+            stage = config_manager.get_model_registry_config().stage \
+                if current is not None and current.using_registry else None
+            candidate = await asyncio.to_thread(PredictionPipeline, stage)
+            if current is not None and candidate.model_version == current.model_version and not force:
+                MODEL_RELOADS.labels(outcome="unchanged").inc()
+                return {"status": "unchanged", "model_version": current.model_version}
+
+            await asyncio.to_thread(warm_up, candidate)
+            if current is not None:
+                await asyncio.to_thread(validate_candidate, candidate, current)
+        except ValueError as e:
+            MODEL_RELOADS.labels(outcome="rejected").inc()
+            logger.error(f"Model reload rejected: {e}")
+            raise HTTPException(status_code=409, detail=str(e))
+        except Exception as e:
+            MODEL_RELOADS.labels(outcome="failed").inc()
+            logger.exception("Model reload failed")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        bundle_path = None
+        if reload_marker is not None or (executor is not None and executor.config.kind == "process"):
+            # Other serving workers and process executor workers map the new model from one bundle
+            bundle_path = await asyncio.to_thread(export_model_bundle, candidate, serving_config.model_bundle_dir)
+        if executor is not None and executor.config.kind == "process":
+            # Process workers hold their own copy: start a pool on the new bundle, drain the old one
+            await executor.restart(str(bundle_path))
+            await prime_executor(candidate)
+
+        activate(candidate)
+        elapsed = time.perf_counter() - start
+        MODEL_RELOAD_SECONDS.observe(elapsed)
+        MODEL_RELOADS.labels(outcome="swapped").inc()
+        logger.info(f"Hot-swapped model {current.model_version if current else None} -> {candidate.model_version} in {elapsed:.2f}s")
+        if reload_marker is not None:
+            seen_reloads["model"] = await asyncio.to_thread(
+                reload_marker.publish, "model", model_version=candidate.model_version, bundle=str(bundle_path)
+            )
+        return {"status": "swapped", "model_version": candidate.model_version, "reload_s": round(elapsed, 3)}
+
+async def adopt_model(model_version: str, bundle_path: str):
+    """Swaps in a model another serving worker reloaded, mapped from the bundle it exported."""
+    async with reload_lock:
+        if predictor is not None and predictor.model_version == model_version:
+            return
+        start = time.perf_counter()
+        current = predictor
+        candidate = await asyncio.to_thread(load_model_bundle, Path(bundle_path))
+        await asyncio.to_thread(warm_up, candidate)
+        if current is not None:
+            await asyncio.to_thread(validate_candidate, candidate, current)
+        if executor is not None and executor.config.kind == "process":
+            await executor.restart(bundle_path)
+            await prime_executor(candidate)
+        activate(candidate)
+        MODEL_RELOAD_SECONDS.observe(time.perf_counter() - start)
+        MODEL_RELOADS.labels(outcome="swapped").inc()
+        logger.info(f"Followed reload {current.model_version if current else None} -> {model_version}")
+
+async def follow_reloads():
+    """Applies model and policy reloads that another serving worker received."""
+    while True:
+        await asyncio.sleep(model_reload_config.sync_interval_seconds)
+        try:
+            state = await asyncio.to_thread(reload_marker.read)
+            model = state.get("model")
+            if model is not None and model["generation"] > seen_reloads["model"]:
+                seen_reloads["model"] = model["generation"]
+                await adopt_model(model["model_version"], model["bundle"])
+            policy_reload = state.get("policy")
+            if policy_reload is not None and policy_reload["generation"] > seen_reloads["policy"]:
+                seen_reloads["policy"] = policy_reload["generation"]
+                reload_policy()
+        except Exception as e:
+            MODEL_RELOADS.labels(outcome="failed").inc()
+            logger.warning(f"Following a reload from another worker failed: {e}")
+
+async def poll_registry():
+    """Hot-swaps whenever the registry stage points at a version we aren't serving."""
+    model_cache = ModelCache(config_manager.get_model_registry_config())
+    while True:
+        await asyncio.sleep(model_reload_config.poll_interval_seconds)
+        if predictor is None or not predictor.using_registry:
+            continue
+        try:
+            version = await asyncio.to_thread(model_cache.registry_version)
+            if predictor.model_version != f"{model_cache.config.model_name}/{version}":
+                await reload_model()
+        except Exception as e:
+            logger.warning(f"Registry poll failed: {e}")
+
+async def sync_at_risk_queue():
+    """Publishes this worker's at-risk queue and applies orders other workers resolved."""
+    while True:
+        try:
+            snapshots = await asyncio.to_thread(at_risk_queue.read_snapshots)
+            await asyncio.to_thread(at_risk_queue.write, at_risk_queue.apply(snapshots))
+        except Exception as e:
+            logger.warning(f"At-risk queue sync failed: {e}")
+        await asyncio.sleep(at_risk_queue_config.sync_interval_seconds)
+
+def require_model():
+    if predictor is None:
+        raise HTTPException(status_code=503, detail="Model is still loading", headers={"Retry-After": "5"})
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    STARTUP_PHASE_SECONDS.labels(phase="app_import").set(time.perf_counter() - IMPORT_START)
+    model_task = asyncio.create_task(resolve_model())
+    poll_task = asyncio.create_task(poll_registry()) if model_reload_config.poll_interval_seconds > 0 else None
+    drift_task = asyncio.create_task(publish_drift()) if drift_monitor is not None else None
+    follow_task = asyncio.create_task(follow_reloads()) if reload_marker is not None else None
+    queue_task = asyncio.create_task(sync_at_risk_queue()) \
+        if isinstance(at_risk_queue, SharedAtRiskQueue) else None
+    if executor is not None:
+        executor.start()
+    if batcher is not None:
+        await batcher.start()
+    if shadow is not None:
+        await shadow.start()
+    if prediction_log is not None:
+        await prediction_log.start()
+    yield
+    model_task.cancel()
+    if poll_task is not None:
+        poll_task.cancel()
+    if drift_task is not None:
+        drift_task.cancel()
+    if follow_task is not None:
+        follow_task.cancel()
+    if queue_task is not None:
+        queue_task.cancel()
+        at_risk_queue.close()
+    if shadow is not None:
+        await shadow.stop()
+    if prediction_log is not None:
+        await prediction_log.stop()
+    if batcher is not None:
+        await batcher.stop()
+    if executor is not None:
+        executor.stop()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Drop this worker's live gauges from the aggregated /metrics view
+        multiprocess.mark_process_dead(os.getpid())
+
+app = FastAPI(title="Customer Satisfaction Intelligence API", lifespan=lifespan)
 Instrumentator().instrument(app).expose(app)
+if phase_timer is not None:
+    app.add_middleware(
+        PhaseTimingMiddleware, timer=phase_timer, paths=["/predict", "/predict/batch", "/predict/batch/columnar"]
+    )
+
+def count_predictions(interpretation: np.ndarray):
+    for label, count in zip(*np.unique(interpretation, return_counts=True)):
+        PREDICTION_COUNT.labels(result=str(label)).inc(int(count))
+
+def build_encoder(policy: DecisionPolicy) -> Optional[ResponseEncoder]:
+    if not response_encoding_config.enabled:
+        return None
+    return ResponseEncoder(policy, on_interpret=count_predictions)
+
+# Pre-encoded JSON templates for the current policy; rebuilt with it
+encoder = build_encoder(policy)
+
+def interpret_scores(sat_probs, inference_time: float) -> List[dict]:
+    """Maps satisfaction probabilities to the business response payload, one per row."""
+    return build_results(policy, sat_probs, inference_time, on_interpret=count_predictions)
+
+def interpret_score(sat_prob: float, inference_time: float) -> dict:
+    return interpret_scores([sat_prob], inference_time)[0]
+
+def interpret_columns(sat_probs: np.ndarray) -> dict:
+    """Column-wise interpret_scores for columnar batch responses."""
+    tiers = policy.interpret(sat_probs)
+    count_predictions(tiers["interpretation"])
+    return {
+        "satisfaction_probability": np.round(sat_probs, 4),
+        "churn_probability": np.round(1 - sat_probs, 4),
+        **{name: tiers[name].astype(str) for name in ("interpretation", "recommended_action", "risk_level", "alert_color")}
+    }
+
+@app.get("/health")
+async def health_route():
+    if predictor is None:
+        return {"status": "loading"}
+    return {
+        "status": "ready",
+        "model_version": predictor.model_version,
+        "model_source": predictor.model_source,
+        "model_digest": predictor.model_digest,
+        "thread_budget": thread_allocation.as_dict() if thread_allocation is not None else None
+    }
+
+@app.get("/health/live")
+async def liveness_route():
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness_route(response: Response):
+    if predictor is None:
+        response.status_code = 503
+        return {"status": "loading"}
+    return {"status": "ready", "model_version": predictor.model_version}
+
+@app.get("/stats/risk")
+async def risk_stats_route(
+    window_minutes: Optional[int] = None, segment: Optional[str] = None, min_orders: int = 1
+):
+    """
+    Share of at-risk orders and mean churn probability per segment value, over
+    each configured window (or only `window_minutes`) ending now.
+    """
+    if risk_window is None:
+        raise HTTPException(status_code=404, detail="Risk windows are disabled")
+    if segment is not None and segment not in risk_window_config.segments:
+        raise HTTPException(status_code=422, detail=f"segment must be one of {risk_window_config.segments}")
+    windows = risk_window_config.windows_minutes
+    if window_minutes is not None:
+        if not 0 < window_minutes * 60 <= risk_window.n_buckets * risk_window_config.bucket_seconds:
+            raise HTTPException(status_code=422, detail=f"window_minutes must be between 1 and {max(windows)}")
+        windows = [window_minutes]
+    return {
+        "bucket_seconds": risk_window_config.bucket_seconds,
+        "alert_color": risk_window_config.alert_color,
+        "windows": [risk_window.stats(window, segment, min_orders) for window in windows]
+    }
+
+def require_admin(x_admin_token: Optional[str]):
+    expected = os.environ.get(model_reload_config.admin_token_env)
+    if expected and x_admin_token != expected:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+async def at_risk_entries():
+    """The queue's entries, merged across workers when it is shared; snapshot files are read off the loop."""
+    if isinstance(at_risk_queue, SharedAtRiskQueue):
+        snapshots = await asyncio.to_thread(at_risk_queue.read_snapshots)
+        return at_risk_queue.merge(snapshots)
+    return at_risk_queue.entries()
+
+def require_at_risk_queue():
+    if at_risk_queue is None:
+        raise HTTPException(status_code=404, detail="The at-risk queue is disabled")
+
+@app.get("/queue/at-risk")
+async def at_risk_queue_route(
+    limit: int = 100, customer_state: Optional[str] = None, product_category_name: Optional[str] = None
+):
+    """Highest-churn queued orders first, optionally for one customer_state / product_category_name."""
+    require_at_risk_queue()
+    filters = {"customer_state": customer_state, "product_category_name": product_category_name}
+    unsupported = [field for field, value in filters.items()
+                   if value is not None and field not in at_risk_queue_config.segments]
+    if unsupported:
+        raise HTTPException(status_code=422, detail=f"at_risk_queue.segments does not include {unsupported}")
+    entries = await at_risk_entries()
+    orders = rank(entries, max(limit, 0), filters)
+    return {"count": len(orders), "queued": len(entries), "orders": orders}
+
+@app.delete("/queue/at-risk/{order_id}")
+async def resolve_at_risk_route(order_id: str, x_admin_token: Optional[str] = Header(default=None)):
+    """Removes an order the intervention team has handled."""
+    require_admin(x_admin_token)
+    require_at_risk_queue()
+    if isinstance(at_risk_queue, SharedAtRiskQueue):
+        snapshots = await asyncio.to_thread(at_risk_queue.read_snapshots)
+        resolved = at_risk_queue.resolve(order_id, snapshots)
+        if resolved:
+            # Publish now rather than at the next sync, so other workers stop listing it
+            await asyncio.to_thread(at_risk_queue.write, at_risk_queue.snapshot())
+        queued = len(at_risk_queue.merge(snapshots))
+    else:
+        resolved = at_risk_queue.resolve(order_id)
+        queued = len(at_risk_queue)
+    if not resolved:
+        raise HTTPException(status_code=404, detail=f"Order {order_id} is not queued")
+    return {"status": "resolved", "order_id": order_id, "queued": queued}
+
+@app.post("/admin/reload")
+async def reload_route(force: bool = False, x_admin_token: Optional[str] = Header(default=None)):
+    require_admin(x_admin_token)
+    return await reload_model(force=force)
+
+def reload_policy():
+    """Re-reads decision_policy from params.yaml and swaps it in; raises if the tables are invalid."""
+    global policy, encoder
+    config = ConfigurationManager().get_decision_policy_config()
+    candidate = DecisionPolicy(config)
+    if phase_timer is not None:
+        candidate.on_phase = phase_timer.record
+    candidate_encoder = build_encoder(candidate)
+    policy, encoder = candidate, candidate_encoder
+    logger.info(f"Decision policy reloaded (unsatisfied_threshold={config.unsatisfied_threshold})")
+    return config
+
+@app.post("/admin/policy/reload")
+async def reload_policy_route(x_admin_token: Optional[str] = Header(default=None)):
+    """Re-reads decision_policy from params.yaml and swaps it in for all later responses."""
+    require_admin(x_admin_token)
+    try:
+        config = reload_policy()
+    except Exception as e:
+        logger.error(f"Decision policy reload rejected: {e}")
+        raise HTTPException(status_code=409, detail=str(e))
+    if reload_marker is not None:
+        seen_reloads["policy"] = await asyncio.to_thread(reload_marker.publish, "policy")
+    return {
+        "status": "reloaded",
+        "unsatisfied_threshold": config.unsatisfied_threshold,
+        "interpretation": config.interpretation_tiers,
+        "risk_level": config.risk_tiers
+    }
 
 @app.post("/predict")
 async def predict_route(data: CustomerData):
+    enter_phase(None)
+    require_model()
     try:
         # Start timer for Latency Alarm
         start_time = time.perf_counter()
         
-        df = pd.DataFrame([data.model_dump()])
         # Extract probability for Class 1 (Satisfied)
-        probs = predictor.model.predict_proba(df)[0]
-        sat_prob = float(probs[1])
+        # Cache hits skip admission; only actual scoring takes a slot
+        record = data.features()
+        compute = lambda: admit(lambda: score_one(record))
+        if cache is not None:
+            sat_prob = await cache.get_or_compute(record, compute, predictor.model_version)
+        else:
+            sat_prob = await compute()
         
         # Record Latency
         inference_time = time.perf_counter() - start_time
         MODEL_LATENCY.observe(inference_time)
+        if shadow is not None:
+            shadow.offer([record], [sat_prob])
+        record_risk([record], [sat_prob])
+        queue_at_risk([data.order_id], [record], [sat_prob])
+        if drift_monitor is not None:
+            drift_monitor.observe_record(record)
+        log_predictions([record], [sat_prob], [data.order_id])
         
-        # --- SCENARIO MAPPING ---
-        # Scenario A: Operational Action
-        if sat_prob >= 0.80:
-            interpretation = "Highly Satisfied"
-            action = "Automated Follow-up (Thank You)"
-            status_code = "GREEN"
-        elif 0.60 <= sat_prob < 0.80:
-            interpretation = "Satisfied"
-            action = "Standard Processing"
-            status_code = "GREEN"
-        elif 0.40 <= sat_prob < 0.60:
-            interpretation = "Neutral / Needs Attention"
-            action = "Proactive Support Email"
-            status_code = "YELLOW"
-        else:
-            interpretation = "High Risk"
-            action = "Urgent Manager Intervention"
-            status_code = "RED"
+        enter_phase("serialize")
+        if encoder is not None:
+            return Response(content=encoder.encode_one(sat_prob, inference_time), media_type="application/json")
+        return interpret_score(sat_prob, inference_time)
+    except HTTPException:
+        raise
+    except Exception as e:
+        # Increment error counter for the Error Alarm
+        PREDICTION_ERRORS.inc()
+        logger.error("Inference Error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/predict/batch")
+async def predict_batch_route(records: List[CustomerData]):
+    enter_phase(None)
+    if not records:
+        raise HTTPException(status_code=422, detail="Batch must contain at least one record")
+    require_model()
+    try:
+        start_time = time.perf_counter()
 
-        # Scenario B: Strategic Risk Level
-        if sat_prob >= 0.70: risk_level = "Negligible"
-        elif sat_prob >= 0.60: risk_level = "Low"
-        elif sat_prob >= 0.40: risk_level = "Moderate"
-        else: risk_level = "Critical"
+        # One frame and one predict_proba for the whole batch
+        raw = [record.features() for record in records]
+        sat_probs = await admit(lambda: score_records_async(raw))
 
-        PREDICTION_COUNT.labels(result=interpretation).inc()
-        
+        inference_time = time.perf_counter() - start_time
+        per_row_time = inference_time / len(records)
+        BATCH_LATENCY.labels(kind="batch").observe(inference_time)
+        BATCH_SIZE.observe(len(records))
+        BATCH_ROW_LATENCY.observe(per_row_time)
+        if shadow is not None:
+            shadow.offer(raw, sat_probs)
+        record_risk(raw, sat_probs)
+        queue_at_risk([record.order_id for record in records], raw, sat_probs)
+        if drift_monitor is not None:
+            drift_monitor.observe_records(raw)
+        log_predictions(raw, sat_probs, [record.order_id for record in records])
+
+        enter_phase("serialize")
+        if encoder is not None:
+            content = encoder.encode_batch(sat_probs, per_row_time, inference_time)
+            return Response(content=content, media_type="application/json")
         return {
             "status": "success",
-            "metadata": {
-                "interpretation": interpretation,
-                "recommended_action": action,
-                "risk_level": risk_level,
-                "alert_color": status_code,
-                "latency_s": round(inference_time, 4)
-            },
-            "scores": {
-                "satisfaction_probability": round(sat_prob, 4),
-                "churn_probability": round(1 - sat_prob, 4)
-            }
+            "count": len(records),
+            "latency_s": round(inference_time, 4),
+            "results": interpret_scores(sat_probs, per_row_time)
         }
+    except HTTPException:
+        raise
+    except Exception as e:
+        PREDICTION_ERRORS.inc()
+        logger.error("Batch Inference Error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/predict/batch/columnar")
+async def predict_columnar_route(request: Request):
+    """
+    Scores a column-oriented batch: an Arrow IPC stream or a msgpack map of
+    column -> values, with one column per schema inference feature.
+
+    Responds in the same format when the Accept header names it, otherwise
+    with the /predict/batch JSON shape.
+    """
+    fmt = media_type(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Send application/vnd.apache.arrow.stream or application/msgpack (use /predict/batch for JSON)"
+        )
+    require_model()
+    # Refuse oversized bodies before buffering them; rows are checked from the format headers before decoding
+    max_body_bytes = columnar_codec.config.max_body_bytes
+    too_large = HTTPException(status_code=413, detail=f"Columnar body exceeds {max_body_bytes} bytes")
+    declared = request.headers.get("content-length")
+    if declared is not None and declared.isdigit() and int(declared) > max_body_bytes:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_body_bytes:
+            raise too_large
+    try:
+        start_time = time.perf_counter()
+        columns = columnar_codec.decode(bytes(body), fmt)
+        COLUMNAR_DECODE_LATENCY.labels(format=fmt).observe(time.perf_counter() - start_time)
+    except UnsupportedFormatError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ColumnarValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    # Reading and decoding the body count as parsing here
+    enter_phase(None)
+
+    try:
+        sat_probs = await admit(lambda: score_columns_async(columns))
+
+        inference_time = time.perf_counter() - start_time
+        n_rows = len(sat_probs)
+        per_row_time = inference_time / n_rows
+        BATCH_LATENCY.labels(kind="columnar").observe(inference_time)
+        BATCH_SIZE.observe(n_rows)
+        BATCH_ROW_LATENCY.observe(per_row_time)
+        if shadow is not None:
+            shadow.offer(columns, sat_probs)
+        record_risk_columns(columns, sat_probs)
+        if drift_monitor is not None:
+            drift_monitor.observe_columns(columns)
+        log_predictions(columns, sat_probs)
+
+        enter_phase("serialize")
+        response_fmt = media_type(request.headers.get("accept"))
+        if response_fmt is not None:
+            content = columnar_codec.encode(interpret_columns(sat_probs), response_fmt)
+            return Response(content=content, media_type=response_fmt)
+
+        if encoder is not None:
+            content = encoder.encode_batch(sat_probs, per_row_time, inference_time)
+            return Response(content=content, media_type="application/json")
+        return {
+            "status": "success",
+            "count": n_rows,
+            "latency_s": round(inference_time, 4),
+            "results": interpret_scores(sat_probs, per_row_time)
+        }
+    except UnsupportedFormatError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        # Increment error counter for the Error Alarm
         PREDICTION_ERRORS.inc()
-        logger.error(f"Inference Error: {e}")
+        logger.error("Columnar Batch Inference Error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/explain")
+async def explain_route(records: List[CustomerData]):
+    """
+    Per-feature risk drivers for a batch of orders, from the tree champion's own
+    contribution method. One-hot columns are folded back onto their raw feature.
+    """
+    if not explanation_config.enabled:
+        raise HTTPException(status_code=404, detail="Explanations are disabled")
+    if not records or len(records) > explanation_config.max_batch_size:
+        raise HTTPException(
+            status_code=422, detail=f"Send between 1 and {explanation_config.max_batch_size} orders"
+        )
+    require_model()
+    pipeline = predictor
+    try:
+        start_time = time.perf_counter()
+        raw = [record.features() for record in records]
+
+        if explanation_cache is not None:
+            keys, results = explanation_cache.lookup_many(raw, pipeline.model_version)
+        else:
+            keys, results = None, [None] * len(raw)
+
+        # Only orders not already explained for this model version are computed, in one batch
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            computed = await admit(lambda: explain_records_async(pipeline, [raw[i] for i in misses]))
+            for i, result in zip(misses, computed):
+                results[i] = result
+            if explanation_cache is not None:
+                explanation_cache.store_many([keys[i] for i in misses], computed, pipeline.model_version)
+
+        latency = time.perf_counter() - start_time
+        EXPLANATION_LATENCY.observe(latency)
+        return {
+            "status": "success",
+            "count": len(results),
+            "model_version": pipeline.model_version,
+            "latency_s": round(latency, 4),
+            "results": results
+        }
+    except HTTPException:
+        raise
+    except UnsupportedModelError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        EXPLANATION_ERRORS.inc()
+        logger.error("Explanation Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/predict/stream")
+async def predict_stream_route(request: Request):
+    """
+    Scores an NDJSON (default) or CSV (Content-Type: text/csv) body of orders in
+    fixed-size chunks and streams one NDJSON result line back per input row.
+    """
+    require_model()
+    fmt = CSV if "csv" in request.headers.get("content-type", "") else NDJSON
+    reader = StreamReader(streaming_config, fmt)
+
+    async def results():
+        try:
+            async for chunk in reader.chunks(request.stream()):
+                start_time = time.perf_counter()
+                lines, valid = {}, []
+                for row, item in chunk:
+                    try:
+                        if isinstance(item, Exception):
+                            raise item
+                        order = CustomerData(**item)
+                        valid.append((row, order.features(), order.order_id))
+                    except (ValueError, ValidationError) as e:
+                        lines[row] = json.dumps({"row": row, "status": "error", "detail": str(e)})
+
+                if valid:
+                    records = [record for _, record, _ in valid]
+                    # Each chunk takes an admission slot like a /predict/batch call
+                    sat_probs = await admit(lambda: score_records_async(records))
+                    if shadow is not None:
+                        shadow.offer(records, sat_probs)
+                    record_risk(records, sat_probs)
+                    queue_at_risk([order_id for _, _, order_id in valid], records, sat_probs)
+                    if drift_monitor is not None:
+                        drift_monitor.observe_records(records)
+                    log_predictions(records, sat_probs, [order_id for _, _, order_id in valid])
+                    inference_time = time.perf_counter() - start_time
+                    BATCH_LATENCY.labels(kind="stream_chunk").observe(inference_time)
+                    STREAM_CHUNK_THROUGHPUT.observe(len(valid) / max(inference_time, 1e-9))
+                    per_row_time = inference_time / len(valid)
+                    for (row, _, order_id), scored in zip(valid, interpret_scores(sat_probs, per_row_time)):
+                        result = {"row": row, **scored}
+                        if order_id is not None:
+                            result["order_id"] = order_id
+                        lines[row] = dumps(result).decode()
+
+                STREAM_ROWS.labels(status="scored").inc(len(valid))
+                STREAM_ROWS.labels(status="invalid").inc(len(chunk) - len(valid))
+                yield "\n".join(lines[row] for row, _ in chunk) + "\n"
+        except HTTPException as e:
+            # Shed by admission control: stop here, the client can resend the unanswered rows
+            yield json.dumps({"status": "error", "detail": e.detail}) + "\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band and stop
+            PREDICTION_ERRORS.inc()
+            logger.error("Stream Inference Error: %s", e)
+            yield json.dumps({"status": "error", "detail": str(e)}) + "\n"
+
+    return DuplexStreamingResponse(results(), media_type="application/x-ndjson")
+
+def serve_preforked(workers: int):
+    """
+    Loads the model once, then forks `workers` uvicorn servers on one listening
+    socket, so every worker shares the parent's model pages copy-on-write
+    instead of unpickling its own copy. Exited workers are replaced until the
+    parent is told to stop.
+    """
+    global preloaded_pipeline
+    preloaded_pipeline = load_serving_pipeline()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((serving_config.host, serving_config.port))
+    sock.listen(2048)
+
+    children = set()
+    stopping = False
+
+    def fork_worker():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            uvicorn.Server(uvicorn.Config(app)).run(sockets=[sock])
+            os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    for _ in range(workers):
+        fork_worker()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    logger.info(f"Forked {workers} workers sharing {preloaded_pipeline.model_version}")
+    while children:
+        pid, status = os.wait()
+        children.discard(pid)
+        multiprocess.mark_process_dead(pid)
+        if not stopping:
+            logger.warning(f"Worker {pid} exited with status {status}, forking a replacement")
+            fork_worker()
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8080)
\ No newline at end of file
+    workers = thread_allocation.workers if thread_allocation is not None \
+        else int(os.environ.get("WEB_CONCURRENCY", serving_config.workers))
+
+    if os.environ.get(PREFORK_ENV):
+        serve_preforked(workers)
+    elif workers > 1:
+        # Counters/histograms are written per process and summed on /metrics
+        metrics_dir = serving_config.metrics_dir.resolve()
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        metrics_dir.mkdir(parents=True)
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = str(metrics_dir)
+        # Reloads published by a previous deployment's workers no longer apply
+        ReloadMarker(serving_config.model_bundle_dir / RELOAD_MARKER_FILE).clear()
+        shutil.rmtree(at_risk_queue_config.shared_dir, ignore_errors=True)
+
+        # Export once here; every worker memory-maps the same read-only file
+        init_registry()
+        pipeline = load_serving_pipeline()
+        bundle_path = export_model_bundle(pipeline, serving_config.model_bundle_dir)
+        os.environ[MODEL_BUNDLE_ENV] = str(bundle_path.resolve())
+        # Workers recompute the same thread split from the (possibly capped) worker count
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+
+        if is_array_bundle(pipeline):
+            # Hand over to the uvicorn CLI: re-running this file as each worker's __main__
+            # would register every metric twice, and exec frees this process' model copy
+            logger.info(f"Starting {workers} workers sharing {bundle_path}")
+            command = [
+                sys.executable, "-m", "uvicorn", "app:app",
+                "--host", serving_config.host,
+                "--port", str(serving_config.port),
+                "--workers", str(workers)
+            ]
+        else:
+            # Unpickling sklearn trees or CatBoost models copies them into every worker, so
+            # load once and fork instead; re-exec first, since this process imported the
+            # metrics before PROMETHEUS_MULTIPROC_DIR was set
+            logger.info(f"{pipeline.model_version} cannot be shared as arrays, forking {workers} workers from one copy")
+            os.environ[PREFORK_ENV] = "1"
+            command = [sys.executable, os.path.abspath(__file__)]
+        if log_listener is not None:
+            # exec skips atexit: flush queued log records first
+            log_listener.stop()
+        os.execv(sys.executable, command)
+    else:
+        uvicorn.run(app, host=serving_config.host, port=serving_config.port)
\ No newline at end of file
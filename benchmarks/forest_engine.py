@@ -0,0 +1,50 @@
+"""
+Micro-benchmark: sklearn predict_proba vs the compiled forest engine for every
+trained tree ensemble in artifacts/model_training.
+
+Each model is compiled (which already checks it against predict_proba on
+random probe rows), then compared again on the transformed test set before
+timing. Models that cannot be compiled are listed and skipped.
+
+    python benchmarks/forest_engine.py
+"""
+import timeit
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+from customerSatisfaction.config.configuration import ConfigurationManager
+from customerSatisfaction.components.compiled_forest import compile_forest
+
+BATCH_SIZES = [1, 100, 10000]
+
+
+def main():
+    config_manager = ConfigurationManager()
+    config = config_manager.get_model_training_config()
+    test_df = pd.read_csv(config.test_data_path)
+    # The trained classifiers were fit on Stage 04 output, as ModelEvaluation scores them
+    transformer = joblib.load(config_manager.get_feature_transformation_config().transformer_path)
+    X = transformer.transform(test_df.drop(columns=[config.target_column]))
+    X = np.asarray(X.toarray() if hasattr(X, "toarray") else X, dtype=np.float32)
+
+    print(f"{'model':<22} {'rows':>6} {'sklearn (us)':>14} {'compiled (us)':>14} {'speedup':>8}")
+    for path in sorted(Path(config.root_dir).glob("*.joblib")):
+        model = joblib.load(path)
+        compiled = compile_forest(model)
+        if compiled is None:
+            print(f"{path.stem:<22} not a supported tree ensemble, skipped")
+            continue
+        max_diff = np.abs(compiled.predict_proba(X) - model.predict_proba(X)).max()
+        assert max_diff < 1e-9, f"{path.stem}: compiled probabilities differ by {max_diff}"
+
+        for n in BATCH_SIZES:
+            rows = X[:n]
+            number = max(1, 2000 // n)
+            baseline = min(timeit.repeat(lambda: model.predict_proba(rows), number=number, repeat=5)) / number
+            fast = min(timeit.repeat(lambda: compiled.predict_proba(rows), number=number, repeat=5)) / number
+            print(f"{path.stem:<22} {len(rows):>6} {baseline * 1e6:>14.1f} {fast * 1e6:>14.1f} {baseline / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Micro-benchmark: cost of one logger call on the calling thread for each
+logging mode in config.yaml (`logging`).
+
+Every mode writes to a temporary file plus a stdout stand-in: /dev/null, and a
+slow stream that takes 0.2 ms per write, like a pipe into a busy log
+collector. Queue mode only pays for the enqueue; the listener thread does the
+writing and is drained before the next mode runs. The last rows compare a
+disabled debug call with an eagerly formatted f-string against lazy %-style
+arguments.
+
+    python benchmarks/logging_modes.py
+"""
+import logging
+import os
+import tempfile
+import time
+import timeit
+from customerSatisfaction import log_listener
+from customerSatisfaction.utils.logging_setup import configure_logging
+
+CALLS = 5000
+TEXT_FORMAT = "[%(asctime)s: %(levelname)s: %(module)s: %(message)s]"
+
+MODES = {
+    "sync text": {"mode": "sync", "format": "text"},
+    "sync json": {"mode": "sync", "format": "json"},
+    "queue text": {"mode": "queue", "format": "text", "queue_size": CALLS * 2},
+    "queue json": {"mode": "queue", "format": "json", "queue_size": CALLS * 2},
+    "queue text + sampling": {
+        "mode": "queue", "format": "text", "queue_size": CALLS * 2,
+        "sampling": {"enabled": True, "burst": 20, "window_seconds": 1.0}
+    }
+}
+
+
+class SlowStream:
+    def __init__(self, stream, seconds: float):
+        self.stream = stream
+        self.seconds = seconds
+
+    def write(self, text: str):
+        time.sleep(self.seconds)
+        self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def reset_root():
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+
+def per_call_us(name: str, settings: dict, log_path: str, stdout) -> float:
+    logger = logging.getLogger(f"bench.{name}.{id(stdout)}")
+    listener = configure_logging(
+        logger, [logging.FileHandler(log_path), logging.StreamHandler(stdout)], TEXT_FORMAT, settings
+    )
+    rows = iter(range(10 ** 9))
+    elapsed = timeit.timeit(lambda: logger.info("Scored %d rows in %.3f ms", next(rows), 1.234), number=CALLS)
+    if listener is not None:
+        listener.stop()
+    reset_root()
+    return elapsed / CALLS * 1e6
+
+
+def main():
+    # Start from a bare root logger, whatever the package configured on import
+    if log_listener is not None:
+        log_listener.stop()
+    reset_root()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        log_path = os.path.join(tmp, "bench.log")
+        slow = SlowStream(devnull, 0.0002)
+        print(f"{'mode':<26} {'/dev/null (us)':>15} {'slow stdout (us)':>17}")
+        for name, settings in MODES.items():
+            fast_us = per_call_us(name, settings, log_path, devnull)
+            slow_us = per_call_us(name, settings, log_path, slow)
+            print(f"{name:<26} {fast_us:>15.2f} {slow_us:>17.2f}")
+
+        logger = logging.getLogger("bench.disabled")
+        logger.setLevel(logging.INFO)
+        payload = {"rows": 100, "latency_ms": 1.234}
+        eager = timeit.timeit(lambda: logger.debug(f"Scored batch {payload}"), number=CALLS)
+        lazy = timeit.timeit(lambda: logger.debug("Scored batch %s", payload), number=CALLS)
+        print(f"{'disabled debug, f-string':<26} {eager / CALLS * 1e6:>15.2f}")
+        print(f"{'disabled debug, %-args':<26} {lazy / CALLS * 1e6:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
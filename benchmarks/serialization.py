@@ -0,0 +1,65 @@
+"""
+Micro-benchmark: current /predict response path vs the pre-encoded ResponseEncoder.
+
+The current path builds the nested dicts with round() and lets FastAPI encode
+them (jsonable_encoder + json.dumps, as JSONResponse does). Both outputs are
+parsed back and compared before timing.
+
+    python benchmarks/serialization.py
+"""
+import json
+import timeit
+import numpy as np
+from customerSatisfaction.config.configuration import ConfigurationManager
+from customerSatisfaction.components.decision_policy import DecisionPolicy
+from customerSatisfaction.components.response_encoder import ResponseEncoder, build_results
+
+try:
+    from fastapi.encoders import jsonable_encoder
+except ImportError:
+    def jsonable_encoder(obj):
+        return obj
+
+BATCH_SIZES = [1, 100, 10000]
+LATENCY = 0.0123456
+
+
+def current_path(policy: DecisionPolicy, probs: np.ndarray) -> bytes:
+    if len(probs) == 1:
+        payload = build_results(policy, probs, LATENCY)[0]
+    else:
+        payload = {
+            "status": "success",
+            "count": len(probs),
+            "latency_s": round(LATENCY * len(probs), 4),
+            "results": build_results(policy, probs, LATENCY)
+        }
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode()
+
+
+def encoded_path(encoder: ResponseEncoder, probs: np.ndarray) -> bytes:
+    if len(probs) == 1:
+        return encoder.encode_one(float(probs[0]), LATENCY)
+    return encoder.encode_batch(probs, LATENCY, LATENCY * len(probs))
+
+
+def main():
+    policy = DecisionPolicy(ConfigurationManager().get_decision_policy_config())
+    encoder = ResponseEncoder(policy)
+    rng = np.random.default_rng(42)
+
+    print(f"{'rows':>6} {'current (us)':>14} {'encoded (us)':>14} {'speedup':>8}")
+    for n in BATCH_SIZES:
+        probs = rng.random(n)
+        assert json.loads(current_path(policy, probs)) == json.loads(encoded_path(encoder, probs))
+
+        number = max(1, 20000 // n)
+        current = min(timeit.repeat(lambda: current_path(policy, probs), number=number, repeat=5)) / number
+        encoded = min(timeit.repeat(lambda: encoded_path(encoder, probs), number=number, repeat=5)) / number
+        print(f"{n:>6} {current * 1e6:>14.1f} {encoded * 1e6:>14.1f} {current / encoded:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
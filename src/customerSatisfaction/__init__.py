@@ -1,19 +1,34 @@
 import os
 import sys
 import logging
+import yaml
+from customerSatisfaction.constants import CONFIG_FILE_PATH
+from customerSatisfaction.utils.logging_setup import configure_logging
 
 logging_str = "[%(asctime)s: %(levelname)s: %(module)s: %(message)s]"
 log_dir = "logs"
 log_filepath = os.path.join(log_dir, "running_logs.log")
 os.makedirs(log_dir, exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format=logging_str,
+logger = logging.getLogger("customerSatisfactionLogger")
+
+
+def _logging_settings() -> dict:
+    # Read directly: ConfigurationManager itself logs through this logger
+    try:
+        with open(CONFIG_FILE_PATH) as f:
+            return (yaml.safe_load(f) or {}).get("logging") or {}
+    except OSError:
+        return {}
+
+
+# mode: sync writes on the calling thread; queue hands records to a background listener
+log_listener = configure_logging(
+    logger,
     handlers=[
         logging.FileHandler(log_filepath), # THIS writes to the history file
         logging.StreamHandler(sys.stdout)  # THIS writes to your terminal
-    ]
+    ],
+    text_format=logging_str,
+    settings=_logging_settings()
 )
-
-logger = logging.getLogger("customerSatisfactionLogger")
\ No newline at end of file
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Awaitable, Callable, Optional, TypeVar
+from customerSatisfaction.entity.config_entity import AdmissionControlConfig
+
+T = TypeVar("T")
+
+
+class AdmissionRejected(Exception):
+    """The request was shed before any scoring work started."""
+
+    reason = "rejected"
+
+
+class QueueFullError(AdmissionRejected):
+    reason = "queue_full"
+
+
+class DeadlineExceededError(AdmissionRejected):
+    reason = "deadline"
+
+
+class AdmissionController:
+    """
+    Bounds in-flight inference requests and fails fast once the server is saturated.
+
+    At most `max_concurrent` requests score at a time and at most `max_queue`
+    more wait for a slot. A request arriving to a full queue is shed at once,
+    and one that waits longer than `deadline_ms` for a slot is shed then.
+    Admitted requests always run to completion: cancelling an await does not
+    stop predict_proba in a worker, so it would free no capacity.
+    """
+
+    def __init__(
+        self,
+        config: AdmissionControlConfig,
+        on_shed: Optional[Callable[[str], None]] = None,
+        on_occupancy: Optional[Callable[[int, int], None]] = None
+    ):
+        """
+        Args:
+            config: Concurrency, queue and deadline limits
+            on_shed: Called with "queue_full" or "deadline" for every rejected request
+            on_occupancy: Called with (in_flight, waiting) whenever either changes
+        """
+        self.config = config
+        self.on_shed = on_shed
+        self.on_occupancy = on_occupancy
+        self._deadline = config.deadline_ms / 1000.0
+        self._slots = asyncio.Semaphore(config.max_concurrent)
+        self._in_flight = 0
+        self._waiting = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def _changed(self):
+        if self.on_occupancy is not None:
+            self.on_occupancy(self._in_flight, self._waiting)
+
+    def _reject(self, error: AdmissionRejected):
+        if self.on_shed is not None:
+            self.on_shed(error.reason)
+        raise error
+
+    async def _acquire(self):
+        if self._slots.locked():
+            if self._waiting >= self.config.max_queue:
+                self._reject(QueueFullError(
+                    f"Inference queue is full ({self._in_flight} scoring, {self._waiting} waiting)"
+                ))
+            self._waiting += 1
+            self._changed()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self._deadline)
+            except asyncio.TimeoutError:
+                self._reject(DeadlineExceededError(
+                    f"No inference slot within {self.config.deadline_ms:g} ms"
+                ))
+            finally:
+                self._waiting -= 1
+                self._changed()
+        else:
+            await self._slots.acquire()
+        self._in_flight += 1
+        self._changed()
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Awaits `fn()` once a slot is free.
+
+        Raises:
+            QueueFullError: max_queue requests are already waiting
+            DeadlineExceededError: No slot freed up within deadline_ms
+        """
+        await self._acquire()
+        try:
+            return await fn()
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+            self._changed()
@@ -0,0 +1,274 @@
+import itertools
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from customerSatisfaction.entity.config_entity import AtRiskQueueConfig
+
+# (order_id, churn_probability, details with "scored_at")
+Entry = Tuple[str, float, dict]
+
+
+def rank(entries: Iterable[Entry], limit: Optional[int], filters: Optional[Dict[str, str]]) -> List[dict]:
+    """Entries matching every filter (detail field -> value) as response rows, highest churn probability first."""
+    filters = {field: value for field, value in (filters or {}).items() if value is not None}
+    results = []
+    for order_id, churn_prob, details in sorted(entries, key=lambda entry: (-entry[1], entry[2]["scored_at"])):
+        if all(details.get(field) == value for field, value in filters.items()):
+            results.append({"order_id": order_id, "churn_probability": round(churn_prob, 4), **details})
+            if limit is not None and len(results) >= limit:
+                break
+    return results
+
+
+class AtRiskQueue:
+    """
+    The `capacity` highest-churn orders seen so far, kept up to date as orders
+    are scored.
+
+    Entries live in a min-heap on churn probability, so the least at-risk
+    queued order sits at the root and is the one evicted when a riskier order
+    arrives with the queue full. An order-id -> heap position index lets a
+    re-scored order be moved in place, and a resolved order be removed, in
+    O(log capacity) instead of searching the heap.
+    """
+
+    def __init__(self, config: AtRiskQueueConfig):
+        self.config = config
+        # [churn_probability, sequence, order_id, details]; sequence breaks ties oldest-first
+        self._heap: List[list] = []
+        self._position: Dict[str, int] = {}
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._position
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._position[heap[i][2]] = i
+        self._position[heap[j][2]] = j
+
+    def _sift_up(self, i: int):
+        while i > 0:
+            parent = (i - 1) // 2
+            if self._heap[i][:2] >= self._heap[parent][:2]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int):
+        n = len(self._heap)
+        while True:
+            smallest = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < n and self._heap[child][:2] < self._heap[smallest][:2]:
+                    smallest = child
+            if smallest == i:
+                return
+            self._swap(i, smallest)
+            i = smallest
+
+    def _remove_at(self, i: int) -> list:
+        last = len(self._heap) - 1
+        if i != last:
+            self._swap(i, last)
+        entry = self._heap.pop()
+        del self._position[entry[2]]
+        if i < len(self._heap):
+            self._sift_up(i)
+            self._sift_down(i)
+        return entry
+
+    def update(self, order_id: str, churn_prob: float, details: dict) -> bool:
+        """
+        Queues or re-scores an order. An order re-scored below
+        min_churn_probability leaves the queue.
+
+        Returns:
+            Whether the order is queued afterwards
+        """
+        churn_prob = float(churn_prob)
+        entry = [churn_prob, next(self._sequence), order_id, {**details, "scored_at": time.time()}]
+        i = self._position.get(order_id)
+        if i is not None:
+            if churn_prob < self.config.min_churn_probability:
+                self._remove_at(i)
+                return False
+            self._heap[i] = entry
+            self._sift_up(i)
+            self._sift_down(self._position[order_id])
+            return True
+
+        if churn_prob < self.config.min_churn_probability:
+            return False
+        if len(self._heap) >= self.config.capacity:
+            if entry[:2] <= self._heap[0][:2]:
+                return False
+            # Riskier than the least at-risk queued order: it takes the root's place
+            del self._position[self._heap[0][2]]
+            self._heap[0] = entry
+            self._position[order_id] = 0
+            self._sift_down(0)
+            return True
+
+        self._heap.append(entry)
+        self._position[order_id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+        return True
+
+    def resolve(self, order_id: str, scored_before: Optional[float] = None) -> bool:
+        """
+        Removes a handled order, or with `scored_before`, only if it was last
+        scored no later than that. Returns False if nothing was removed.
+        """
+        i = self._position.get(order_id)
+        if i is None:
+            return False
+        if scored_before is not None and self._heap[i][3]["scored_at"] > scored_before:
+            return False
+        self._remove_at(i)
+        return True
+
+    def entries(self) -> List[Entry]:
+        return [(order_id, churn_prob, details) for churn_prob, _, order_id, details in self._heap]
+
+    def top(self, limit: Optional[int] = None, filters: Optional[Dict[str, str]] = None) -> List[dict]:
+        """Queued orders matching every filter (detail field -> value), highest churn probability first."""
+        return rank(self.entries(), limit, filters)
+
+
+class SharedAtRiskQueue:
+    """
+    One at-risk queue across every serving worker process.
+
+    Each worker still scores into its own AtRiskQueue, so the request path
+    takes no cross-process lock. Every `sync_interval_seconds` the worker
+    writes a snapshot of it to `<shared_dir>/<pid>.json`, together with the
+    orders it removed recently: resolved, or re-scored below
+    min_churn_probability. Reads merge the live local queue with every other
+    snapshot, where the latest score of an order wins and removals hide older
+    scores. Every worker also applies the others' removals to its own queue.
+    Answers therefore don't depend on which worker serves them, and another
+    worker's scores show up within one sync interval.
+
+    `read_snapshots` and `write` are the only methods doing file I/O, and they
+    don't touch the local queue, so serving code runs them off the event loop.
+    Everything else runs on the loop, alongside `update`.
+    """
+
+    # Removals are published this many sync intervals, long enough for every worker to apply them
+    REMOVAL_TTL_SYNCS = 10
+
+    def __init__(self, queue: AtRiskQueue, shared_dir: Path, sync_interval_seconds: float):
+        self.queue = queue
+        self.shared_dir = Path(shared_dir)
+        self.removal_ttl = self.REMOVAL_TTL_SYNCS * sync_interval_seconds
+        # order_id -> when this worker removed it
+        self._removed: Dict[str, float] = {}
+        # Orders queued in other workers' last snapshots, so re-scoring one low here is published
+        self._elsewhere: set = set()
+
+    @property
+    def config(self) -> AtRiskQueueConfig:
+        return self.queue.config
+
+    @property
+    def path(self) -> Path:
+        # Resolved per call: preforked workers inherit this object from the parent
+        return self.shared_dir / f"{os.getpid()}.json"
+
+    def update(self, order_id: str, churn_prob: float, details: dict) -> bool:
+        was_queued = order_id in self.queue
+        queued = self.queue.update(order_id, churn_prob, details)
+        if not queued and float(churn_prob) < self.config.min_churn_probability \
+                and (was_queued or order_id in self._elsewhere):
+            self._removed[order_id] = time.time()
+        return queued
+
+    def read_snapshots(self) -> List[dict]:
+        """Other live workers' snapshots; those of exited workers are deleted."""
+        snapshots = []
+        own_path = self.path
+        for path in self.shared_dir.glob("*.json"):
+            if path == own_path:
+                continue
+            try:
+                os.kill(int(path.stem), 0)
+            except ProcessLookupError:
+                path.unlink(missing_ok=True)
+                continue
+            except (ValueError, PermissionError):
+                pass
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+        return snapshots
+
+    def _removals(self, snapshots: List[dict]) -> Dict[str, float]:
+        removed = dict(self._removed)
+        for snapshot in snapshots:
+            for order_id, removed_at in snapshot["removed"].items():
+                removed[order_id] = max(removed.get(order_id, removed_at), removed_at)
+        return removed
+
+    def merge(self, snapshots: List[dict]) -> List[Entry]:
+        """The shared queue: the top `capacity` orders of the local queue and `snapshots`, highest churn first."""
+        removed = self._removals(snapshots)
+        latest: Dict[str, Entry] = {}
+        for order_id, churn_prob, details in itertools.chain(
+            self.queue.entries(), *(snapshot["entries"] for snapshot in snapshots)
+        ):
+            if removed.get(order_id, -1.0) >= details["scored_at"]:
+                continue
+            current = latest.get(order_id)
+            if current is None or details["scored_at"] > current[2]["scored_at"]:
+                latest[order_id] = (order_id, churn_prob, details)
+        return sorted(latest.values(), key=lambda entry: (-entry[1], entry[2]["scored_at"]))[:self.config.capacity]
+
+    def resolve(self, order_id: str, snapshots: List[dict]) -> bool:
+        """
+        Removes a handled order from every worker's queue (once `write` publishes
+        the returned removal). Returns False if no worker had it queued.
+        """
+        if not any(entry[0] == order_id for entry in self.merge(snapshots)):
+            return False
+        self.queue.resolve(order_id)
+        self._removed[order_id] = time.time()
+        return True
+
+    def apply(self, snapshots: List[dict]) -> dict:
+        """
+        Applies other workers' removals to the local queue.
+
+        Returns:
+            This worker's snapshot, for `write`
+        """
+        for order_id, removed_at in self._removals(snapshots).items():
+            self.queue.resolve(order_id, scored_before=removed_at)
+        self._elsewhere = {entry[0] for snapshot in snapshots for entry in snapshot["entries"]}
+        expired = time.time() - self.removal_ttl
+        self._removed = {order_id: at for order_id, at in self._removed.items() if at > expired}
+        return self.snapshot()
+
+    def snapshot(self) -> dict:
+        return {"entries": self.queue.entries(), "removed": dict(self._removed)}
+
+    def write(self, snapshot: dict):
+        """Publishes `snapshot` as this worker's file."""
+        self.shared_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path
+        tmp_path = self.shared_dir / f".{path.name}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+
+    def close(self):
+        """Withdraws this worker's snapshot (on shutdown)."""
+        self.path.unlink(missing_ok=True)
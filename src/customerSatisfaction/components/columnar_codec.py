@@ -0,0 +1,210 @@
+import importlib
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from customerSatisfaction.entity.config_entity import ColumnarBatchConfig
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/msgpack"
+
+# Accepted Content-Type / Accept spellings -> canonical media type
+MEDIA_TYPES = {
+    ARROW_STREAM: ARROW_STREAM,
+    "application/x-arrow-stream": ARROW_STREAM,
+    MSGPACK: MSGPACK,
+    "application/x-msgpack": MSGPACK,
+}
+
+
+class UnsupportedFormatError(Exception):
+    """The media type is unknown, or its library is not installed."""
+
+
+class ColumnarValidationError(ValueError):
+    """Raised with one message per failed column check."""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def media_type(header: Optional[str]) -> Optional[str]:
+    """Canonical columnar media type named in a Content-Type / Accept header, if any."""
+    for part in (header or "").split(","):
+        canonical = MEDIA_TYPES.get(part.split(";")[0].strip().lower())
+        if canonical is not None:
+            return canonical
+    return None
+
+
+def _require(module: str):
+    # pyarrow / msgpack are optional: JSON-only deployments never import them
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise UnsupportedFormatError(f"'{module}' is not installed on this server")
+
+
+class ColumnarCodec:
+    """
+    Decodes Arrow IPC stream / msgpack batch bodies straight into per-feature
+    NumPy columns and encodes column-oriented responses.
+
+    Validation runs once per column (dtype, missing values, integer-ness and
+    schema ranges) instead of once per row through CustomerData.
+    msgpack bodies are a map of column name -> list of values.
+    """
+
+    def __init__(self, config: ColumnarBatchConfig):
+        self.config = config
+
+    def decode(self, body: bytes, fmt: str) -> Dict[str, np.ndarray]:
+        """
+        Returns:
+            Validated {feature: column} with float64 numerical and object categorical columns
+        Raises:
+            UnsupportedFormatError: Unknown format or missing library
+            ColumnarValidationError: Any column failed validation
+        """
+        if fmt == ARROW_STREAM:
+            raw = self._read_arrow(body)
+        elif fmt == MSGPACK:
+            raw = self._read_msgpack(body)
+        else:
+            raise UnsupportedFormatError(f"Unsupported columnar format '{fmt}'")
+        return self.validate(raw)
+
+    def _check_rows(self, n_rows: int):
+        if n_rows > self.config.max_rows:
+            raise ColumnarValidationError([f"Batch has {n_rows} rows, limit is {self.config.max_rows}"])
+
+    def _read_arrow(self, body: bytes) -> Dict[str, object]:
+        pa = _require("pyarrow")
+        try:
+            reader = pa.ipc.open_stream(body)
+            # Record batch headers carry their row counts: stop before materializing an oversized batch
+            batches, n_rows = [], 0
+            for batch in reader:
+                n_rows += batch.num_rows
+                self._check_rows(n_rows)
+                batches.append(batch)
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+        except pa.ArrowInvalid as e:
+            raise ColumnarValidationError([f"Invalid Arrow IPC stream: {e}"])
+        columns = {}
+        for name in table.column_names:
+            column = table.column(name)
+            if pa.types.is_dictionary(column.type):
+                column = column.cast(column.type.value_type)
+            columns[name] = column
+        return columns
+
+    def _read_msgpack(self, body: bytes) -> Dict[str, object]:
+        msgpack = _require("msgpack")
+        # The first column's array header gives the row count before anything is decoded
+        unpacker = msgpack.Unpacker(raw=False)
+        unpacker.feed(body)
+        try:
+            if unpacker.read_map_header():
+                unpacker.skip()
+                n_rows = unpacker.read_array_header()
+            else:
+                n_rows = 0
+        except Exception:
+            # Malformed: unpackb below reports it
+            n_rows = 0
+        self._check_rows(n_rows)
+        try:
+            payload = msgpack.unpackb(body, raw=False)
+        except Exception as e:
+            raise ColumnarValidationError([f"Invalid msgpack body: {e}"])
+        if not isinstance(payload, dict) or not all(isinstance(v, list) for v in payload.values()):
+            raise ColumnarValidationError(["msgpack body must be a map of column name -> list of values"])
+        return payload
+
+    @staticmethod
+    def _to_numpy(column, numeric: bool) -> np.ndarray:
+        # msgpack lists and pyarrow ChunkedArrays (numeric nulls come back as NaN)
+        values = np.asarray(column) if isinstance(column, list) \
+            else column.to_numpy(zero_copy_only=False)
+        if not numeric:
+            return values.astype(object, copy=False)
+        if values.dtype.kind not in "biuf":
+            kind = pd.api.types.infer_dtype(values, skipna=True)
+            if kind not in ("integer", "floating", "mixed-integer-float", "boolean", "empty"):
+                raise TypeError(f"expected numbers, got {kind}")
+        # None becomes NaN and is reported as missing
+        return values.astype(np.float64, copy=False)
+
+    def validate(self, raw: Dict[str, object]) -> Dict[str, np.ndarray]:
+        """Runs the column-wise checks and converts every feature to a NumPy array."""
+        expected = self.config.numerical_features + self.config.categorical_features
+        missing = [c for c in expected if c not in raw]
+        if missing:
+            raise ColumnarValidationError([f"Missing columns: {missing}"])
+
+        lengths = {len(raw[c]) for c in expected}
+        if len(lengths) != 1:
+            raise ColumnarValidationError([f"Columns have different lengths: {sorted(lengths)}"])
+        n_rows = lengths.pop()
+        if n_rows == 0:
+            raise ColumnarValidationError(["Batch must contain at least one row"])
+        self._check_rows(n_rows)
+
+        errors, columns = [], {}
+        for name in self.config.numerical_features:
+            try:
+                values = self._to_numpy(raw[name], numeric=True)
+            except (TypeError, ValueError) as e:
+                errors.append(f"{name}: {e}")
+                continue
+
+            bad = ~np.isfinite(values)
+            if bad.any():
+                errors.append(f"{name}: {int(bad.sum())} missing or non-finite values (first at row {int(bad.argmax())})")
+                continue
+            if name in self.config.integer_features:
+                bad = values != np.floor(values)
+                if bad.any():
+                    errors.append(f"{name}: {int(bad.sum())} non-integer values (first at row {int(bad.argmax())})")
+            if name in self.config.ranges:
+                low, high = self.config.ranges[name]
+                bad = (values < low) | (values > high)
+                if bad.any():
+                    errors.append(
+                        f"{name}: {int(bad.sum())} values outside [{low}, {high}] (first at row {int(bad.argmax())})"
+                    )
+            columns[name] = values
+
+        for name in self.config.categorical_features:
+            try:
+                values = self._to_numpy(raw[name], numeric=False)
+            except ValueError as e:
+                errors.append(f"{name}: {e}")
+                continue
+            bad = pd.isna(values)
+            if bad.any():
+                errors.append(f"{name}: {int(bad.sum())} missing values (first at row {int(bad.argmax())})")
+                continue
+            if pd.api.types.infer_dtype(values, skipna=False) != "string":
+                errors.append(f"{name}: expected strings")
+                continue
+            columns[name] = values
+
+        if errors:
+            raise ColumnarValidationError(errors)
+        return columns
+
+    def encode(self, columns: Dict[str, np.ndarray], fmt: str) -> bytes:
+        """Serializes equal-length result columns in the requested format."""
+        if fmt == ARROW_STREAM:
+            pa = _require("pyarrow")
+            table = pa.table(columns)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return sink.getvalue().to_pybytes()
+        if fmt == MSGPACK:
+            msgpack = _require("msgpack")
+            return msgpack.packb({name: np.asarray(values).tolist() for name, values in columns.items()})
+        raise UnsupportedFormatError(f"Unsupported columnar format '{fmt}'")
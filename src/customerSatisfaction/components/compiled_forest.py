@@ -0,0 +1,141 @@
+import copy
+import numpy as np
+from scipy.special import expit
+from sklearn.ensemble import AdaBoostClassifier, GradientBoostingClassifier, RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from customerSatisfaction import logger
+from customerSatisfaction.components.model_cascade import CascadeClassifier
+
+
+class CompiledForest:
+    """
+    Flat NumPy replay of a fitted binary tree ensemble.
+
+    Every tree's nodes are concatenated into contiguous child / feature /
+    threshold arrays, with leaves pointing at themselves. predict_proba walks
+    all trees for the whole batch in lockstep, one vectorized step per level,
+    then combines leaf values the way the ensemble does:
+
+    - RandomForest: mean of the leaves' class distributions
+    - GradientBoosting: sigmoid(init + learning_rate * sum of leaf values)
+    - AdaBoost (SAMME over trees): sigmoid(weighted vote of the leaves' classes)
+    """
+
+    def __init__(self, estimator):
+        """
+        Raises:
+            ValueError: If the estimator is not a supported binary tree ensemble
+        """
+        if len(getattr(estimator, "classes_", [])) != 2:
+            raise ValueError(f"Expected a fitted binary classifier, got {type(estimator).__name__}")
+        self.estimator = estimator
+        self.classes_ = estimator.classes_
+        self.bias = 0.0
+
+        if isinstance(estimator, RandomForestClassifier):
+            self.link = "mean"
+            trees = [tree.tree_ for tree in estimator.estimators_]
+            leaf_values = [tree.value[:, 0, :] / tree.value[:, 0, :].sum(axis=1, keepdims=True) for tree in trees]
+        elif isinstance(estimator, GradientBoostingClassifier):
+            self.link = "logistic"
+            trees = [tree.tree_ for tree in estimator.estimators_[:, 0]]
+            leaf_values = [estimator.learning_rate * tree.value[:, 0, :1] for tree in trees]
+        elif isinstance(estimator, AdaBoostClassifier):
+            if not all(isinstance(tree, DecisionTreeClassifier) for tree in estimator.estimators_):
+                raise ValueError("AdaBoost can only be compiled over decision trees")
+            self.link = "logistic"
+            trees = [tree.tree_ for tree in estimator.estimators_]
+            weights = estimator.estimator_weights_[:len(trees)]
+            # SAMME, binary: each tree votes +-2w/sum(w) for class 1 vs class 0
+            leaf_values = [
+                (2 * w / weights.sum()) * np.where(np.argmax(tree.value[:, 0, :], axis=1) == 1, 1.0, -1.0)[:, None]
+                for tree, w in zip(trees, weights)
+            ]
+        else:
+            raise ValueError(f"{type(estimator).__name__} is not a supported tree ensemble")
+
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        self.roots = offsets[:-1]
+        self.n_trees = len(trees)
+        self.max_depth = max(tree.max_depth for tree in trees)
+
+        left, right, feature, threshold = [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            leaf = tree.children_left < 0
+            own = np.arange(tree.node_count) + offset
+            # Leaves loop onto themselves, so every row can take max_depth steps
+            left.append(np.where(leaf, own, tree.children_left + offset))
+            right.append(np.where(leaf, own, tree.children_right + offset))
+            feature.append(np.where(leaf, 0, tree.feature))
+            threshold.append(np.where(leaf, np.inf, tree.threshold))
+
+        self.left = np.concatenate(left).astype(np.int32)
+        self.right = np.concatenate(right).astype(np.int32)
+        self.feature = np.concatenate(feature).astype(np.int32)
+        self.threshold = np.concatenate(threshold)
+        self.leaf_values = np.concatenate(leaf_values).astype(np.float64)
+
+    def _leaf_sum(self, X: np.ndarray) -> np.ndarray:
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, None]
+        node = np.tile(self.roots, (len(X), 1))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.leaf_values[node].sum(axis=1)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        values = self._leaf_sum(X)
+        if self.link == "mean":
+            return values / self.n_trees
+        p = expit(self.bias + values[:, 0])
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def without_estimator(self) -> "CompiledForest":
+        """A copy holding only the flat arrays, e.g. for a model bundle workers memory-map."""
+        compiled = copy.copy(self)
+        compiled.estimator = None
+        return compiled
+
+
+def compile_forest(estimator, atol: float = 1e-9, n_probes: int = 512):
+    """
+    Compiles a tree ensemble (or each stage of a cascade) and checks it against
+    estimator.predict_proba on random probe rows.
+
+    Returns:
+        The compiled replacement, or None if it cannot be compiled faithfully
+    """
+    if isinstance(estimator, CascadeClassifier):
+        first_stage, champion = compile_forest(estimator.first_stage), compile_forest(estimator.champion)
+        if first_stage is None and champion is None:
+            return None
+        return CascadeClassifier(
+            first_stage or estimator.first_stage, champion or estimator.champion,
+            estimator.boundaries, estimator.half_width
+        )
+
+    if not isinstance(estimator, (RandomForestClassifier, GradientBoostingClassifier, AdaBoostClassifier)):
+        logger.info(f"{type(estimator).__name__} is not a tree ensemble, forest engine not used")
+        return None
+
+    try:
+        compiled = CompiledForest(estimator)
+        probes = np.random.default_rng(0).normal(size=(n_probes, estimator.n_features_in_)).astype(np.float32)
+        if compiled.link == "logistic":
+            # Whatever the init estimator predicts is constant per row
+            compiled.bias = float(estimator.decision_function(probes[:1])[0] - compiled._leaf_sum(probes[:1])[0, 0])
+        if not np.allclose(compiled.predict_proba(probes), estimator.predict_proba(probes), rtol=1e-7, atol=atol):
+            raise ValueError("Compiled probabilities do not match predict_proba")
+        logger.info(
+            f"Compiled {type(estimator).__name__} forest engine "
+            f"({compiled.n_trees} trees, {len(compiled.left)} nodes, depth {compiled.max_depth})"
+        )
+        return compiled
+    except Exception as e:
+        logger.warning(f"Forest engine disabled for {type(estimator).__name__}, using predict_proba: {e}")
+        return None
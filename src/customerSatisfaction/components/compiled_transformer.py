@@ -0,0 +1,125 @@
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from customerSatisfaction import logger
+
+
+class CompiledTransformer:
+    """
+    Flat NumPy replay of the fitted Stage 4 ColumnTransformer.
+
+    StandardScaler blocks become mean/scale vectors and OneHotEncoder blocks
+    become category -> output-column dicts, so raw request records can be
+    written straight into a float32 matrix without building a DataFrame or
+    dispatching through sklearn.
+    """
+
+    def __init__(self, transformer: ColumnTransformer):
+        """
+        Raises:
+            ValueError: If the transformer contains a step this class cannot replay
+        """
+        if not hasattr(transformer, "transformers_"):
+            raise ValueError(f"Expected a fitted ColumnTransformer, got {type(transformer).__name__}")
+
+        self.numeric_blocks = []       # (columns, out_offset, mean, scale)
+        self.categorical_blocks = []   # (column, {category: out_index}, raise_on_unknown)
+        offset = 0
+
+        for name, step, columns in transformer.transformers_:
+            if step == "drop" or len(columns) == 0:
+                continue
+            if not all(isinstance(c, str) for c in columns):
+                raise ValueError(f"Step '{name}' selects columns by position, cannot compile")
+
+            if isinstance(step, StandardScaler):
+                mean = step.mean_ if step.with_mean else np.zeros(len(columns))
+                scale = step.scale_ if step.with_std else np.ones(len(columns))
+                self.numeric_blocks.append((list(columns), offset, mean, scale))
+                offset += len(columns)
+            elif step == "passthrough":
+                self.numeric_blocks.append((list(columns), offset, np.zeros(len(columns)), np.ones(len(columns))))
+                offset += len(columns)
+            elif isinstance(step, OneHotEncoder):
+                if step.drop is not None or getattr(step, "_infrequent_enabled", False):
+                    raise ValueError(f"Step '{name}' uses drop/infrequent categories, cannot compile")
+                for column, categories in zip(columns, step.categories_):
+                    index = {category: offset + i for i, category in enumerate(categories)}
+                    self.categorical_blocks.append((column, index, step.handle_unknown == "error"))
+                    offset += len(categories)
+            else:
+                raise ValueError(f"Step '{name}' ({type(step).__name__}) cannot be compiled")
+
+        self.n_features_out = offset
+
+    def transform_records(self, records: List[dict]) -> np.ndarray:
+        """Writes raw records into a preallocated (n_rows, n_features_out) float32 matrix."""
+        out = np.zeros((len(records), self.n_features_out), dtype=np.float32)
+
+        for columns, offset, mean, scale in self.numeric_blocks:
+            raw = np.array([[record[c] for c in columns] for record in records], dtype=np.float64)
+            # Scale in float64 exactly like sklearn, then store as float32
+            out[:, offset:offset + len(columns)] = (raw - mean) / scale
+
+        for column, index, raise_on_unknown in self.categorical_blocks:
+            for row, record in enumerate(records):
+                position = index.get(record[column])
+                if position is not None:
+                    out[row, position] = 1.0
+                elif raise_on_unknown:
+                    raise ValueError(f"Found unknown category {record[column]!r} in column '{column}'")
+
+        return out
+
+    def transform_columns(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Same as transform_records for column-oriented input, without per-row Python work."""
+        n_rows = len(next(iter(columns.values())))
+        out = np.zeros((n_rows, self.n_features_out), dtype=np.float32)
+
+        for names, offset, mean, scale in self.numeric_blocks:
+            raw = np.column_stack([np.asarray(columns[c], dtype=np.float64) for c in names])
+            out[:, offset:offset + len(names)] = (raw - mean) / scale
+
+        rows = np.arange(n_rows)
+        for column, index, raise_on_unknown in self.categorical_blocks:
+            # Look up each distinct category once, then scatter by inverse index
+            uniques, inverse = np.unique(columns[column], return_inverse=True)
+            positions = np.array([index.get(u, -1) for u in uniques], dtype=np.int64)[inverse]
+            known = positions >= 0
+            if raise_on_unknown and not known.all():
+                raise ValueError(f"Found unknown category {columns[column][~known][0]!r} in column '{column}'")
+            out[rows[known], positions[known]] = 1.0
+
+        return out
+
+    def probe_records(self) -> List[dict]:
+        """Synthetic rows (known and unknown categories) used to verify the compilation."""
+        numeric = {c: float(m) for columns, _, mean, _ in self.numeric_blocks for c, m in zip(columns, mean)}
+        known = {column: next(iter(index)) for column, index, _ in self.categorical_blocks}
+        records = [{**numeric, **known}, {**{c: v + 1.5 for c, v in numeric.items()}, **known}]
+        if not any(raise_on_unknown for _, _, raise_on_unknown in self.categorical_blocks):
+            records.append({**numeric, **{column: "__unseen__" for column in known}})
+        return records
+
+
+def compile_transformer(transformer: ColumnTransformer, atol: float = 1e-5) -> Optional[CompiledTransformer]:
+    """
+    Compiles the transformer and checks it against transformer.transform.
+
+    Returns:
+        CompiledTransformer, or None if the transformer cannot be compiled faithfully
+    """
+    try:
+        compiled = CompiledTransformer(transformer)
+        probes = compiled.probe_records()
+        expected = transformer.transform(pd.DataFrame(probes))
+        if hasattr(expected, "toarray"):
+            expected = expected.toarray()
+        if not np.allclose(compiled.transform_records(probes), expected, rtol=1e-6, atol=atol):
+            raise ValueError("Compiled output does not match transformer.transform")
+        return compiled
+    except Exception as e:
+        logger.warning(f"Transformer fast path disabled, using sklearn transform: {e}")
+        return None
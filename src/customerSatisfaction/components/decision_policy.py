@@ -0,0 +1,99 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from customerSatisfaction.entity.config_entity import DecisionPolicyConfig
+
+
+class _TierTable:
+    """Ascending lower bounds -> label columns, looked up with one searchsorted per call."""
+
+    def __init__(self, name: str, tiers: List[dict], fields: List[str]):
+        if not tiers:
+            raise ValueError(f"Decision policy '{name}' has no tiers")
+        mins = [float(tier["min"]) for tier in tiers]
+        if mins[0] > 0.0 or any(b <= a for a, b in zip(mins, mins[1:])):
+            raise ValueError(f"Decision policy '{name}' tiers must start at 0 and strictly ascend, got {mins}")
+        missing = [f for f in fields for tier in tiers if f not in tier]
+        if missing:
+            raise ValueError(f"Decision policy '{name}' tiers are missing {sorted(set(missing))}")
+
+        self.bounds = np.array(mins[1:])
+        self.columns = {field: np.array([str(tier[field]) for tier in tiers], dtype=object) for field in fields}
+
+    def lookup(self, probs: np.ndarray) -> np.ndarray:
+        # side="right": a probability equal to a bound belongs to the tier that starts there
+        return np.searchsorted(self.bounds, probs, side="right")
+
+
+class DecisionPolicy:
+    """
+    Maps satisfaction probabilities to business tiers and class labels.
+
+    Thresholds live in params.yaml (`decision_policy`), so single, batch,
+    streaming and columnar scoring plus Stage 06 evaluation all share them.
+    Every method takes a whole probability array.
+    """
+
+    def __init__(self, config: DecisionPolicyConfig):
+        """
+        Raises:
+            ValueError: If a tier table is empty, unsorted or missing fields
+        """
+        if not 0.0 < config.unsatisfied_threshold < 1.0:
+            raise ValueError(f"unsatisfied_threshold must be in (0, 1), got {config.unsatisfied_threshold}")
+        self.unsatisfied_threshold = config.unsatisfied_threshold
+        self.interpretation = _TierTable(
+            "interpretation", config.interpretation_tiers, ["label", "action", "alert_color"]
+        )
+        self.risk = _TierTable("risk_level", config.risk_tiers, ["label"])
+        # Called with ("decision", seconds) for every tier mapping, when set
+        self.on_phase: Optional[Callable[[str, float], None]] = None
+
+    def unsatisfied_boundaries(self) -> np.ndarray:
+        """Every P(Unsatisfied) at which the class, interpretation tier or risk tier changes."""
+        return np.unique(np.concatenate([
+            [self.unsatisfied_threshold], 1.0 - self.interpretation.bounds, 1.0 - self.risk.bounds
+        ]))
+
+    def served_decisions(self, unsatisfied_probs: np.ndarray) -> np.ndarray:
+        """(n_rows, 3) class, interpretation tier and risk tier: everything served from a probability."""
+        probs = np.asarray(unsatisfied_probs, dtype=np.float64)
+        tier, risk = self._tier_indices(1.0 - probs)
+        return np.column_stack([self.classify(probs), tier, risk])
+
+    def classify(self, unsatisfied_probs: np.ndarray) -> np.ndarray:
+        """Class labels (0 = Unsatisfied, 1 = Satisfied) from P(Unsatisfied)."""
+        return np.where(np.asarray(unsatisfied_probs) >= self.unsatisfied_threshold, 0, 1)
+
+    def tier_indices(self, satisfied_probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Row-wise positions in the interpretation and risk tables."""
+        start = time.perf_counter()
+        indices = self._tier_indices(satisfied_probs)
+        self._report(start)
+        return indices
+
+    def interpret(self, satisfied_probs: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Returns:
+            Equal-length columns: interpretation, recommended_action, alert_color, risk_level
+        """
+        start = time.perf_counter()
+        tier, risk = self._tier_indices(satisfied_probs)
+        columns = {
+            "interpretation": self.interpretation.columns["label"][tier],
+            "recommended_action": self.interpretation.columns["action"][tier],
+            "alert_color": self.interpretation.columns["alert_color"][tier],
+            "risk_level": self.risk.columns["label"][risk]
+        }
+        self._report(start)
+        return columns
+
+    def _tier_indices(self, satisfied_probs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        probs = np.asarray(satisfied_probs, dtype=np.float64)
+        return self.interpretation.lookup(probs), self.risk.lookup(probs)
+
+    def _report(self, start: float):
+        # Policies unpickled from bundles exported before the hook existed have no attribute
+        on_phase = getattr(self, "on_phase", None)
+        if on_phase is not None:
+            on_phase("decision", time.perf_counter() - start)
@@ -0,0 +1,162 @@
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from customerSatisfaction import logger
+from customerSatisfaction.entity.config_entity import DriftMonitorConfig
+
+# Additive smoothing so empty bins keep PSI finite
+PSI_EPSILON = 1e-4
+
+
+def build_reference(
+    frame: pd.DataFrame,
+    numerical: List[str],
+    categorical: List[str],
+    n_bins: int,
+    max_categories: int
+) -> dict:
+    """
+    Binned distribution of each inference feature in the training data.
+
+    Numeric features get quantile bin edges (duplicates merged, so discrete
+    features end up with fewer bins); categorical features keep their
+    `max_categories` most frequent values plus one bin for everything else.
+    """
+    reference = {"rows": len(frame), "numerical": {}, "categorical": {}}
+    cut_points = np.linspace(0, 1, n_bins + 1)[1:-1]
+    for column in numerical:
+        values = frame[column].to_numpy(dtype=np.float64)
+        edges = np.unique(np.quantile(values, cut_points))
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        reference["numerical"][column] = {
+            "edges": edges.tolist(),
+            "proportions": (counts / len(values)).tolist()
+        }
+    for column in categorical:
+        frequencies = frame[column].astype(str).value_counts(normalize=True)
+        top = frequencies.iloc[:max_categories]
+        reference["categorical"][column] = {
+            "categories": top.index.tolist(),
+            "proportions": top.tolist() + [max(0.0, 1.0 - float(top.sum()))]
+        }
+    return reference
+
+
+def load_reference(path: Path) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+class DriftMonitor:
+    """
+    Streaming comparison of live inference features with the training
+    reference exported by FeatureTransformation.
+
+    Every feature's live histogram uses the reference bins, and all of them
+    share one flat count array, so memory is fixed by the reference alone.
+    A request adds one count per feature (a bisect for numeric features, a
+    dict lookup for categorical ones). `publish` turns the counts into PSI and a
+    binned KS statistic (total variation distance for categorical features),
+    then decays them so older traffic fades out.
+    """
+
+    def __init__(
+        self,
+        config: DriftMonitorConfig,
+        reference: dict,
+        on_publish: Optional[Callable[[Dict[str, dict], float], None]] = None
+    ):
+        """
+        Args:
+            config: Publish interval, minimum window size and decay
+            reference: Output of build_reference
+            on_publish: Called with ({feature: {"psi", "distance"}}, rows in the window)
+        """
+        self.config = config
+        self.on_publish = on_publish
+        self._numeric, self._categorical, self._slices = [], [], {}
+        offset = 0
+        for column, spec in reference["numerical"].items():
+            self._numeric.append((column, offset, spec["edges"], np.asarray(spec["edges"])))
+            self._slices[column] = (slice(offset, offset + len(spec["proportions"])), True)
+            offset += len(spec["proportions"])
+        for column, spec in reference["categorical"].items():
+            index = {category: i for i, category in enumerate(spec["categories"])}
+            self._categorical.append((column, offset, index, len(index)))
+            self._slices[column] = (slice(offset, offset + len(spec["proportions"])), False)
+            offset += len(spec["proportions"])
+
+        self._reference = np.concatenate([
+            np.asarray(spec["proportions"], dtype=np.float64)
+            for kind in ("numerical", "categorical") for spec in reference[kind].values()
+        ])
+        self._counts = np.zeros(offset)
+        self.rows = 0.0
+
+    @property
+    def features(self) -> List[str]:
+        return list(self._slices)
+
+    def observe_record(self, record: dict):
+        """Adds one request's features in O(features)."""
+        positions = [offset + bisect_right(edges, record[column]) for column, offset, edges, _ in self._numeric]
+        positions += [
+            offset + index.get(str(record[column]), other) for column, offset, index, other in self._categorical
+        ]
+        # One position per feature, so no position repeats
+        self._counts[positions] += 1.0
+        self.rows += 1
+
+    def observe_columns(self, columns: Dict[str, np.ndarray]):
+        """Adds a validated {feature: column} batch."""
+        positions = [
+            offset + np.searchsorted(edges, np.asarray(columns[column], dtype=np.float64), side="right")
+            for column, offset, _, edges in self._numeric
+        ]
+        positions += [
+            offset + np.fromiter((index.get(str(value), other) for value in columns[column]), dtype=np.intp)
+            for column, offset, index, other in self._categorical
+        ]
+        self._counts += np.bincount(np.concatenate(positions), minlength=len(self._counts))
+        self.rows += len(positions[0]) if positions else 0
+
+    def observe_records(self, records: List[dict]):
+        if len(records) == 1:
+            self.observe_record(records[0])
+        else:
+            self.observe_columns({column: [record[column] for record in records] for column in self._slices})
+
+    def scores(self) -> Dict[str, dict]:
+        """PSI and distance per feature for the current window."""
+        live = self._counts / max(self.rows, 1.0)
+        reference = self._reference
+        results = {}
+        for column, (span, numeric) in self._slices.items():
+            p, q = live[span], reference[span]
+            psi = float(np.sum((p - q) * np.log((p + PSI_EPSILON) / (q + PSI_EPSILON))))
+            if numeric:
+                distance = float(np.max(np.abs(np.cumsum(p) - np.cumsum(q))))
+            else:
+                distance = float(0.5 * np.sum(np.abs(p - q)))
+            results[column] = {"psi": round(psi, 6), "distance": round(distance, 6)}
+        return results
+
+    def publish(self) -> Optional[Dict[str, dict]]:
+        """Reports drift scores once the window holds min_rows rows, then decays the window."""
+        if self.rows < self.config.min_rows:
+            return None
+        results = self.scores()
+        if results:
+            feature = max(results, key=lambda column: results[column]["psi"])
+            logger.info(
+                f"Drift over {self.rows:.0f} rows: highest PSI {results[feature]['psi']:.4f} on {feature} "
+                f"(distance {results[feature]['distance']:.4f})"
+            )
+        if self.on_publish is not None:
+            self.on_publish(results, self.rows)
+        self._counts *= self.config.decay
+        self.rows *= self.config.decay
+        return results
@@ -1,11 +1,13 @@
 import pandas as pd
 import numpy as np
 import joblib
+import json
 import os
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
 from customerSatisfaction import logger
+from customerSatisfaction.components.drift_monitor import build_reference
 from customerSatisfaction.entity.config_entity import FeatureTransformationConfig
 
 class FeatureTransformation:
@@ -121,6 +123,20 @@ class FeatureTransformation:
             
             logger.info(f"    [OK] Preprocessor and CSVs saved to artifacts.")
 
+            # Reference distributions the API's drift monitor compares live traffic against
+            features = self.config.inference_features
+            missing = [f for f in features["numerical"] + features["categorical"] if f not in X_train.columns]
+            if missing:
+                logger.warning(f"    [WARN] Inference features missing from training data, no drift reference: {missing}")
+            else:
+                reference = build_reference(
+                    X_train, features["numerical"], features["categorical"],
+                    self.config.drift_bins, self.config.drift_max_categories
+                )
+                with open(self.config.drift_reference_path, "w") as f:
+                    json.dump(reference, f, indent=2)
+                logger.info(f"    [OK] Drift reference saved to {self.config.drift_reference_path}")
+
             # 9. VALIDATION CHECK
             logger.info("9. Validation Check...")
             try:
@@ -0,0 +1,141 @@
+import asyncio
+import contextvars
+import functools
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
+import numpy as np
+from customerSatisfaction import logger
+from customerSatisfaction.entity.config_entity import InferenceExecutorConfig
+
+# Per-process model copy, populated by the pool initializer in "process" mode
+_worker_pipeline = None
+
+
+def _init_worker(bundle_path: Optional[str] = None):
+    global _worker_pipeline
+    # Imported here so the parent only pays for it when process mode is used
+    from customerSatisfaction.components.model_bundle import load_model_bundle, load_serving_pipeline
+    _worker_pipeline = load_model_bundle(bundle_path) if bundle_path else load_serving_pipeline()
+
+
+def _timed_call(fn: Callable, records: List[dict], submitted: float):
+    # perf_counter is CLOCK_MONOTONIC on Linux, so it is comparable across worker processes
+    started = time.perf_counter()
+    result = fn(records)
+    return result, started - submitted, time.perf_counter() - started
+
+
+def _score_in_worker(records: List[dict]) -> np.ndarray:
+    return _worker_pipeline.predict_records(records)[:, 1]
+
+
+def _score_columns_in_worker(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    return _worker_pipeline.predict_columns(columns)[:, 1]
+
+
+def _call_with_worker_pipeline(fn: Callable, records: List[dict]):
+    return fn(_worker_pipeline, records)
+
+
+class InferenceExecutor:
+    """
+    Runs CPU-bound scoring off the event loop on a bounded worker pool.
+
+    "thread" mode shares the in-process model (sklearn/CatBoost release the GIL
+    for most of predict_proba); "process" mode gives every worker its own
+    preloaded PredictionPipeline so a single container can use all its cores.
+    """
+
+    def __init__(
+        self,
+        config: InferenceExecutorConfig,
+        score_fn: Callable[[List[dict]], np.ndarray],
+        on_complete: Optional[Callable[[float, float], None]] = None,
+        score_columns_fn: Optional[Callable[[Dict[str, np.ndarray]], np.ndarray]] = None
+    ):
+        """
+        Args:
+            config: Pool kind and size
+            score_fn: In-process scorer used by "thread" mode
+            on_complete: Called with (queue_seconds, compute_seconds) per task
+            score_columns_fn: In-process scorer for {feature: column} batches in "thread" mode
+        """
+        self.config = config
+        self.score_fn = score_fn
+        self.score_columns_fn = score_columns_fn
+        self.on_complete = on_complete
+        self._pool: Optional[Executor] = None
+
+    def _create_pool(self, bundle_path: Optional[str] = None) -> Executor:
+        if self.config.kind == "process":
+            # fork keeps startup cheap: workers don't re-import the app module
+            return ProcessPoolExecutor(
+                max_workers=self.config.max_workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(bundle_path,)
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.config.max_workers,
+            thread_name_prefix="inference"
+        )
+
+    def start(self):
+        self._pool = self._create_pool()
+        logger.info(f"Inference executor started ({self.config.kind}, max_workers={self.config.max_workers})")
+
+    async def restart(self, bundle_path: Optional[str] = None):
+        """
+        Swaps in a fresh pool (process workers load `bundle_path`) and drains the
+        old one in the background, so tasks already submitted finish on it.
+        """
+        old_pool, self._pool = self._pool, self._create_pool(bundle_path)
+        if old_pool is not None:
+            await asyncio.to_thread(old_pool.shutdown, wait=True)
+        logger.info(f"Inference executor restarted ({self.config.kind})")
+
+    async def prime(self, records: List[dict]):
+        """
+        Scores `records` once per worker, so in "process" mode every worker is
+        forked and has loaded its model before the first request needs it.
+        """
+        # Concurrent submits make the pool start a worker for each one
+        await asyncio.gather(*(self.run(records) for _ in range(self.config.max_workers)))
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, records: Union[List[dict], Dict[str, np.ndarray]]) -> np.ndarray:
+        """Scores records (or a {feature: column} batch) on the pool and returns P(Satisfied) per row."""
+        if isinstance(records, dict):
+            fn = _score_columns_in_worker if self.config.kind == "process" else self.score_columns_fn
+        else:
+            fn = _score_in_worker if self.config.kind == "process" else self.score_fn
+        return await self._submit(fn, records)
+
+    async def run_with_pipeline(self, fn: Callable, pipeline, records: List[dict]):
+        """
+        fn(pipeline, records) on the pool, for model work other than scoring
+        (e.g. explanations). Process workers pass their own pipeline instead, so
+        `fn` must be a module-level function.
+        """
+        if self.config.kind == "process":
+            return await self._submit(functools.partial(_call_with_worker_pipeline, fn), records)
+        return await self._submit(functools.partial(fn, pipeline), records)
+
+    async def _submit(self, fn: Callable, records):
+        call = _timed_call
+        if self.config.kind != "process":
+            # Like asyncio.to_thread: the worker thread sees the request's context variables
+            call = functools.partial(contextvars.copy_context().run, _timed_call)
+        loop = asyncio.get_running_loop()
+        result, queue_s, compute_s = await loop.run_in_executor(
+            self._pool, call, fn, records, time.perf_counter()
+        )
+        if self.on_complete is not None:
+            self.on_complete(queue_s, compute_s)
+        return result
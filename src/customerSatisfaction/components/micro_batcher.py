@@ -0,0 +1,109 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Set
+import numpy as np
+from customerSatisfaction import logger
+from customerSatisfaction.entity.config_entity import MicroBatchingConfig
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-row /predict calls into one vectorized score call.
+
+    Requests are queued until either `max_batch_size` rows are waiting or the
+    oldest row has waited `max_wait_ms`, then the whole batch is scored at once
+    and each caller's future is resolved with its own probability.
+    """
+
+    def __init__(
+        self,
+        config: MicroBatchingConfig,
+        score_fn: Callable[[List[dict]], Awaitable[np.ndarray]],
+        on_flush: Optional[Callable[[int, List[float]], None]] = None
+    ):
+        """
+        Args:
+            config: Batch size / wait limits
+            score_fn: Coroutine scoring a list of raw records, returns P(Satisfied) per row
+            on_flush: Called with (batch_size, per-row queue waits in seconds)
+        """
+        self.config = config
+        self.score_fn = score_fn
+        self.on_flush = on_flush
+        self._max_wait = config.max_wait_ms / 1000.0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+    def qsize(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Micro-batching started (max_batch_size={self.config.max_batch_size}, "
+            f"max_wait_ms={self.config.max_wait_ms})"
+        )
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        # Let batches that were already collected finish scoring
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    async def submit(self, record: dict) -> float:
+        """Queues one raw record and waits for its satisfaction probability."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((record, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> list:
+        # Block for the first row, then fill the batch until size or deadline
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + self._max_wait
+
+        while len(batch) < self.config.max_batch_size:
+            # Rows that are already queued never need to wait
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Score in the background so the next batch can start filling meanwhile
+            task = asyncio.create_task(self._flush(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list):
+        flush_time = time.perf_counter()
+
+        try:
+            probs = await self.score_fn([record for record, _, _ in batch])
+            for (_, future, _), prob in zip(batch, probs):
+                if not future.done():
+                    future.set_result(float(prob))
+        except Exception as e:
+            logger.error("Micro-batch of %d failed: %s", len(batch), e)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+        if self.on_flush is not None:
+            self.on_flush(len(batch), [flush_time - queued for _, _, queued in batch])
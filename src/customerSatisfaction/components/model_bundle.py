@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+import joblib
+from customerSatisfaction import logger
+from customerSatisfaction.components.compiled_forest import CompiledForest
+from customerSatisfaction.components.model_cascade import CascadeClassifier
+from customerSatisfaction.components.thread_budget import intra_op_threads
+from customerSatisfaction.pipeline.prediction import PredictionPipeline
+
+# Set by the serving parent so every uvicorn / executor worker maps the same file
+MODEL_BUNDLE_ENV = "MODEL_BUNDLE_PATH"
+
+
+def _array_classifier(classifier):
+    """The classifier as flat arrays only (compiled forests without their estimator), or None."""
+    if isinstance(classifier, CompiledForest):
+        return classifier.without_estimator()
+    if isinstance(classifier, CascadeClassifier):
+        first_stage, champion = _array_classifier(classifier.first_stage), _array_classifier(classifier.champion)
+        if first_stage is None or champion is None:
+            return None
+        return CascadeClassifier(first_stage, champion, classifier.boundaries, classifier.half_width)
+    return None
+
+
+def array_bundle_state(pipeline: PredictionPipeline) -> Optional[dict]:
+    """
+    The pipeline reduced to what the compiled fast path scores with: the
+    compiled transformer and the compiled forest arrays, plus metadata.
+    None if the served classifier is not a compiled forest (or cascade of them).
+    """
+    classifier = _array_classifier(pipeline.classifier) if pipeline.compiled is not None else None
+    if classifier is None:
+        return None
+    state = {k: v for k, v in pipeline.__dict__.items() if k not in ("on_cascade", "on_phase")}
+    state.update({
+        "model": None,
+        "transformer": None,
+        "classifier": classifier,
+        "feature_names": pipeline.feature_signature()
+    })
+    return state
+
+
+def bundle_key(pipeline: PredictionPipeline) -> str:
+    """Hash of the model (version and digest) and the serving settings it was loaded with."""
+    key = {
+        "model_version": pipeline.model_version,
+        "model_digest": pipeline.model_digest,
+        "serving_settings": getattr(pipeline, "serving_settings", None)
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def export_model_bundle(pipeline: PredictionPipeline, bundle_dir: Path) -> Path:
+    """
+    Writes the loaded pipeline to one uncompressed joblib file, named after the
+    model and the serving settings it was loaded with (see bundle_key), so a
+    changed forest engine or cascade setting never reuses a stale bundle.
+
+    Uncompressed joblib stores NumPy arrays aligned in the file, so workers can
+    memory-map them instead of each holding a private copy. Unpickling sklearn
+    trees or CatBoost models copies them, though, so when the served
+    classifier compiles to a forest engine the bundle keeps only the flat
+    arrays (see array_bundle_state) and the full pipeline goes to a sidecar
+    file, read only by workers that serve /explain. Other models are bundled
+    whole: check `is_array_bundle` and fork workers from a loaded parent instead.
+
+    Returns:
+        Path of the bundle file
+    """
+    bundle_dir = Path(bundle_dir)
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    digest = bundle_key(pipeline)
+    bundle_path = bundle_dir / f"{digest}.joblib"
+
+    if bundle_path.exists():
+        logger.info(f"Model bundle already exported: {bundle_path}")
+        return bundle_path
+
+    # Serving hooks are process-local; each worker's app sets its own
+    full_state = {k: v for k, v in pipeline.__dict__.items() if k not in ("on_cascade", "on_phase")}
+    state = array_bundle_state(pipeline)
+    if state is not None:
+        estimator_path = bundle_dir / f"{digest}.estimator.joblib"
+        _dump(full_state, estimator_path)
+        state["estimator_bundle_path"] = str(estimator_path.resolve())
+    _dump(state if state is not None else full_state, bundle_path)
+    kind = "arrays only" if state is not None else "full pipeline"
+    logger.info(f"Model bundle exported for {pipeline.model_version} ({kind}): {bundle_path}")
+    return bundle_path
+
+
+def _dump(state: dict, path: Path):
+    # Write then rename so a worker never maps a half-written file
+    tmp_path = path.parent / f".{path.name}.{os.getpid()}.tmp"
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_model_bundle(bundle_path: Path) -> PredictionPipeline:
+    """Rebuilds a PredictionPipeline whose arrays are read-only maps of the bundle file."""
+    pipeline = PredictionPipeline.__new__(PredictionPipeline)
+    pipeline.__dict__.update(joblib.load(bundle_path, mmap_mode="r"))
+    pipeline.limit_threads(intra_op_threads())
+    logger.info(f"Model bundle mapped from {bundle_path} ({pipeline.model_version})")
+    return pipeline
+
+
+def is_array_bundle(pipeline: PredictionPipeline) -> bool:
+    """Whether the pipeline scores from flat arrays alone, so workers can share its bundle."""
+    return getattr(pipeline, "model", None) is None or array_bundle_state(pipeline) is not None
+
+
+def explained_classifier(pipeline: PredictionPipeline):
+    """The classifier with its fitted estimators; array-only bundles read it from their sidecar file."""
+    estimator_path = getattr(pipeline, "estimator_bundle_path", None)
+    if estimator_path is None:
+        return pipeline.classifier
+    return joblib.load(estimator_path, mmap_mode="r")["classifier"]
+
+
+def load_serving_pipeline() -> PredictionPipeline:
+    """Maps the shared bundle when running as a worker, otherwise loads the model normally."""
+    bundle_path = os.environ.get(MODEL_BUNDLE_ENV)
+    if bundle_path:
+        return load_model_bundle(Path(bundle_path))
+    return PredictionPipeline()
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+import mlflow
+import mlflow.sklearn
+from mlflow.tracking import MlflowClient
+from customerSatisfaction import logger
+from customerSatisfaction.entity.config_entity import ModelRegistryConfig
+
+
+class ModelCache:
+    """
+    Content-addressed on-disk cache of registry model versions.
+
+    Each downloaded version lives in `<cache_dir>/<model_name>/<stage>/v<version>-<digest>/`
+    with a manifest recording the stage, registry version and the SHA-256 of
+    its files. Startup only asks the registry which version is current (a
+    metadata call) and downloads the artifacts when that version isn't cached
+    yet. Stages never share entries, so a champion falling back to the cache
+    while the registry is down can't pick up a Staging challenger.
+    """
+
+    def __init__(self, config: ModelRegistryConfig):
+        self.config = config
+        self.root = Path(config.cache_dir) / config.model_name / config.stage
+
+    @staticmethod
+    def digest(model_dir: Path) -> str:
+        """SHA-256 over every file's relative path and bytes, in sorted order."""
+        sha = hashlib.sha256()
+        for path in sorted(p for p in Path(model_dir).rglob("*") if p.is_file()):
+            sha.update(path.relative_to(model_dir).as_posix().encode())
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+        return sha.hexdigest()
+
+    def registry_version(self) -> str:
+        """Asks the registry which version currently holds the configured stage."""
+        client = MlflowClient()
+        versions = client.get_latest_versions(self.config.model_name, stages=[self.config.stage])
+        if not versions:
+            raise LookupError(f"No '{self.config.stage}' version registered for {self.config.model_name}")
+        return str(versions[0].version)
+
+    def _entries(self) -> list:
+        """Cached (manifest, entry_dir) pairs, newest registry version first."""
+        entries = []
+        for manifest_path in self.root.glob("v*/manifest.json"):
+            with open(manifest_path) as f:
+                entries.append((json.load(f), manifest_path.parent))
+        return sorted(entries, key=lambda e: int(e[0]["version"]), reverse=True)
+
+    def _verified(self, manifest: dict, entry_dir: Path) -> bool:
+        if self.digest(entry_dir / "model") == manifest["digest"]:
+            return True
+        logger.warning(f"Cached model {entry_dir} failed its digest check, discarding it")
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return False
+
+    def _find(self, version: Optional[str] = None) -> Optional[Tuple[dict, Path]]:
+        for manifest, entry_dir in self._entries():
+            if manifest.get("stage") != self.config.stage:
+                continue
+            if (version is None or manifest["version"] == version) and self._verified(manifest, entry_dir):
+                return manifest, entry_dir
+        return None
+
+    def _last_resolved(self) -> Optional[str]:
+        """Version the registry last reported for this stage (a rollback may make it older than the newest cached)."""
+        try:
+            return (self.root / "current").read_text().strip() or None
+        except OSError:
+            return None
+
+    def _mark_resolved(self, version: str):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.root / f".current.{os.getpid()}"
+        tmp_path.write_text(version)
+        os.replace(tmp_path, self.root / "current")
+
+    def _download(self, version: str) -> Tuple[dict, Path]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_dir = self.root / f".download-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        mlflow.artifacts.download_artifacts(
+            artifact_uri=f"models:/{self.config.model_name}/{version}",
+            dst_path=str(tmp_dir / "model")
+        )
+        digest = self.digest(tmp_dir / "model")
+        manifest = {
+            "model_name": self.config.model_name,
+            "stage": self.config.stage,
+            "version": version,
+            "digest": digest,
+            "downloaded_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        }
+        with open(tmp_dir / "manifest.json", "w") as f:
+            json.dump(manifest, f, indent=4)
+
+        entry_dir = self.root / f"v{version}-{digest[:12]}"
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            if not entry_dir.exists():
+                raise
+            # Another replica or worker finished the same download first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        logger.info(f"Cached {self.config.model_name} v{version} ({digest[:12]}) at {entry_dir}")
+        return manifest, entry_dir
+
+    def load(self):
+        """
+        Loads the current registry version, from disk whenever possible.
+
+        Returns:
+            (model, info) where info has model_name, version, digest and source
+            ("cache" or "registry"; "cache-offline" if the registry was unreachable)
+        """
+        try:
+            version = self.registry_version()
+        except Exception as e:
+            # Registry down: serve the version last resolved for this stage, else its newest cached one
+            last_resolved = self._last_resolved()
+            cached = (self._find(last_resolved) if last_resolved else None) or self._find()
+            if cached is None:
+                raise
+            logger.warning(f"Registry unavailable ({e}), using cached v{cached[0]['version']}")
+            manifest, entry_dir = cached
+            source = "cache-offline"
+        else:
+            cached = self._find(version)
+            if cached is not None:
+                manifest, entry_dir = cached
+                source = "cache"
+            else:
+                manifest, entry_dir = self._download(version)
+                source = "registry"
+            self._mark_resolved(version)
+
+        model = mlflow.sklearn.load_model(str(entry_dir / "model"))
+        return model, {**manifest, "source": source}
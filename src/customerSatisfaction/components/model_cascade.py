@@ -0,0 +1,86 @@
+from typing import Sequence, Tuple
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+
+def boundary_distance(unsatisfied_probs: np.ndarray, boundaries: np.ndarray) -> np.ndarray:
+    """Distance of each P(Unsatisfied) to the nearest decision boundary."""
+    probs = np.asarray(unsatisfied_probs, dtype=np.float64)
+    return np.abs(probs[:, None] - np.asarray(boundaries, dtype=np.float64)[None, :]).min(axis=1)
+
+
+def calibrate_band(
+    fast_unsatisfied: np.ndarray,
+    served_disagree: np.ndarray,
+    boundaries: Sequence[float],
+    tolerance: float
+) -> float:
+    """
+    Narrowest half-width w such that, outside [b - w, b + w] around every
+    decision boundary b, the fast model's served decision (class,
+    interpretation tier, risk tier) differs from the champion's on at most
+    `tolerance` of the rows.
+
+    Args:
+        fast_unsatisfied: First-stage P(Unsatisfied) per row
+        served_disagree: Whether the row's served decision differs between the two models
+        boundaries: Every P(Unsatisfied) at which a served decision changes (DecisionPolicy.unsatisfied_boundaries)
+        tolerance: Share of rows allowed to disagree outside the band
+    Returns:
+        Half-width of the band: rows within it of any boundary are escalated
+    """
+    distance = boundary_distance(fast_unsatisfied, boundaries)
+    # Disagreements the band leaves out, farthest from a boundary first
+    distance = np.sort(distance[np.asarray(served_disagree, dtype=bool)])[::-1]
+    allowed = int(np.floor(tolerance * len(fast_unsatisfied)))
+    return float(distance[allowed]) if len(distance) > allowed else 0.0
+
+
+class CascadeClassifier(BaseEstimator, ClassifierMixin):
+    """
+    Two-stage classifier: a cheap first-stage model scores every row and only
+    rows whose P(Unsatisfied) lands within `half_width` of a decision boundary
+    (the class threshold or an interpretation / risk tier bound) are re-scored
+    by the champion.
+
+    Built by ModelEvaluation from already fitted models with a half-width from
+    `calibrate_band`, and registered as the classifier step of the served
+    Pipeline. Outside the band the served tiers match the champion's (within
+    the calibration tolerance), but the probabilities themselves are the first
+    stage's.
+    """
+
+    def __init__(self, first_stage, champion, boundaries: Sequence[float], half_width: float):
+        self.first_stage = first_stage
+        self.champion = champion
+        self.boundaries = boundaries
+        self.half_width = half_width
+
+    def __setstate__(self, state):
+        # Cascades registered before tier-aware bands escalated one band around the class threshold
+        if "band_low" in state:
+            band_low, band_high = state.pop("band_low"), state.pop("band_high")
+            state["boundaries"] = [(band_low + band_high) / 2]
+            state["half_width"] = (band_high - band_low) / 2
+        super().__setstate__(state)
+
+    @property
+    def classes_(self):
+        return self.champion.classes_
+
+    def predict_proba_escalated(self, X) -> Tuple[np.ndarray, int]:
+        """
+        Returns:
+            ([P(Unsatisfied), P(Satisfied)] per row, number of rows the champion scored)
+        """
+        probs = np.array(self.first_stage.predict_proba(X), dtype=np.float64)
+        escalate = np.flatnonzero(boundary_distance(probs[:, 0], self.boundaries) <= self.half_width)
+        if len(escalate):
+            probs[escalate] = self.champion.predict_proba(X[escalate])
+        return probs, len(escalate)
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.predict_proba_escalated(X)[0]
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
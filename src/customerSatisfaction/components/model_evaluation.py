@@ -13,6 +13,8 @@ from sklearn.metrics import (
     roc_auc_score, confusion_matrix
 )
 from customerSatisfaction.entity.config_entity import ModelEvaluationConfig
+from customerSatisfaction.components.decision_policy import DecisionPolicy
+from customerSatisfaction.components.model_cascade import CascadeClassifier, calibrate_band
 from customerSatisfaction import logger
 from mlflow.models.signature import infer_signature
 from pathlib import Path
@@ -20,6 +22,7 @@ from pathlib import Path
 class ModelEvaluation:
     def __init__(self, config: ModelEvaluationConfig):
         self.config = config
+        self.policy = DecisionPolicy(config.decision_policy)
         mlflow.set_tracking_uri(self.config.mlflow_uri)
         mlflow.set_experiment("Customer_Satisfaction_Evaluation")
 
@@ -40,6 +43,8 @@ class ModelEvaluation:
             model_files = [f for f in os.listdir(model_dir) if f.endswith('.joblib')]
             
             performance_tracker = []
+            # Fitted models and test-set P(Unsatisfied), for calibrating the cascade
+            fitted_models, test_probas = {}, {}
 
             # 3. Evaluation Loop
             with mlflow.start_run(run_name="Champion_Model_Selection"):
@@ -53,9 +58,11 @@ class ModelEvaluation:
                             
                             # Probability for class 0 (Unsatisfied)
                             y_proba = model_weights.predict_proba(X_test_transformed)[:, 0]
+                            fitted_models[model_name], test_probas[model_name] = model_weights, y_proba
 
-                            custom_threshold = 0.4 
-                            y_pred = np.where(y_proba >= custom_threshold, 0, 1)
+                            # Same threshold the API serves with (params.yaml: decision_policy)
+                            custom_threshold = self.policy.unsatisfied_threshold
+                            y_pred = self.policy.classify(y_proba)
                             
                             # Calculate metrics
                             auc = roc_auc_score(y_test, 1 - y_proba)
@@ -111,7 +118,13 @@ class ModelEvaluation:
                     with open(res_path, "w") as f:
                         json.dump(best_model, f, indent=4)
                     
-                    self._promote_to_production(best_model['run_id'])
+                    artifact_path = "model"
+                    if self.config.cascade.enabled:
+                        artifact_path = self._log_cascade(
+                            best_model, transformer, X_test_raw, X_test_transformed, fitted_models, test_probas
+                        ) or artifact_path
+
+                    self._promote_to_production(best_model['run_id'], artifact_path)
 
             self._print_leaderboard(performance_tracker)
 
@@ -131,10 +144,62 @@ class ModelEvaluation:
         mlflow.log_artifact(path)
         plt.close()
 
-    def _promote_to_production(self, run_id):
+    def _log_cascade(self, champion, transformer, X_test_raw, X_test_transformed, fitted_models, test_probas):
+        """
+        Calibrates the first-stage band against the champion on the test set and
+        logs the cascade Pipeline to the champion's run.
+
+        Returns:
+            Artifact path of the cascade model, or None if there is nothing to cascade
+        """
+        first_stage = self.config.cascade.first_stage_model
+        if first_stage == champion["name"] or first_stage not in fitted_models:
+            logger.warning(f"Cascade skipped: first stage '{first_stage}' is the champion or failed evaluation")
+            return None
+
+        fast_proba, champion_proba = test_probas[first_stage], test_probas[champion["name"]]
+        # Calibrated on everything served from the probability, not only the class
+        boundaries = self.policy.unsatisfied_boundaries()
+        champion_served = self.policy.served_decisions(champion_proba)
+        disagree = (self.policy.served_decisions(fast_proba) != champion_served).any(axis=1)
+        half_width = calibrate_band(fast_proba, disagree, boundaries, self.config.cascade.agreement_tolerance)
+        cascade = CascadeClassifier(
+            fitted_models[first_stage], fitted_models[champion["name"]], boundaries.tolist(), half_width
+        )
+
+        cascade_proba, escalated = cascade.predict_proba_escalated(X_test_transformed)
+        cascade_served = self.policy.served_decisions(cascade_proba[:, 0])
+        y_cascade = cascade_served[:, 0]
+        metrics = {
+            "cascade_half_width": half_width,
+            "cascade_escalation_rate": escalated / len(champion_proba),
+            "cascade_agreement": float(np.mean(y_cascade == champion_served[:, 0])),
+            "cascade_served_agreement": float(np.mean((cascade_served == champion_served).all(axis=1))),
+            "cascade_max_probability_delta": float(np.max(np.abs(cascade_proba[:, 0] - champion_proba)))
+        }
+        logger.info(
+            f"Cascade {first_stage} -> {champion['name']}: half-width {half_width:.4f} around {len(boundaries)} "
+            f"boundaries, escalation {metrics['cascade_escalation_rate']:.2%}, "
+            f"served agreement {metrics['cascade_served_agreement']:.4%}"
+        )
+
+        with mlflow.start_run(run_id=champion["run_id"], nested=True):
+            mlflow.log_metrics(metrics)
+            mlflow.log_param("cascade_first_stage", first_stage)
+            full_pipeline = Pipeline([("preprocessor", transformer), ("classifier", cascade)])
+            signature = infer_signature(X_test_raw, y_cascade)
+            mlflow.sklearn.log_model(full_pipeline, "cascade_model", signature=signature)
+
+        with open(Path(self.config.root_dir) / "cascade.json", "w") as f:
+            json.dump({
+                "first_stage": first_stage, "champion": champion["name"], "boundaries": boundaries.tolist(), **metrics
+            }, f, indent=4)
+        return "cascade_model"
+
+    def _promote_to_production(self, run_id, artifact_path="model"):
         try:
             reg_name = "Customer_Satisfaction_Model"
-            mlflow.register_model(f"runs:/{run_id}/model", reg_name)
+            mlflow.register_model(f"runs:/{run_id}/{artifact_path}", reg_name)
             logger.info(f"Model {run_id} promoted based on balanced metrics.")
         except Exception as e:
             logger.warning(f"Registration skipped: {e}")
@@ -12,6 +12,8 @@ from catboost import CatBoostClassifier
 
 from customerSatisfaction import logger
 
+from customerSatisfaction.components.thread_budget import ThreadBudget
+
 from customerSatisfaction.entity.config_entity import ModelTrainingConfig
 
 
@@ -102,6 +104,17 @@ class ModelTrainer:
 
             
 
+            # Models train one at a time, so each gets the whole core budget
+
+            budget = ThreadBudget(self.config.thread_budget) \
+                if self.config.thread_budget is not None and self.config.thread_budget.enabled else None
+
+            if budget is not None:
+
+                ThreadBudget.apply(budget.for_training(), "training")
+
+            
+
             # 4. TRAIN MODELS
 
             print("\n" + "="*80)
@@ -132,6 +145,10 @@ class ModelTrainer:
 
                     model_class = self.model_map[model_name]
 
+                    if budget is not None:
+
+                        params = budget.training_params(model_class, dict(params))
+
                     
 
                     # Log parameters (picks up 'balanced' weights & 20 epochs for MLP)
@@ -0,0 +1,128 @@
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from customerSatisfaction.entity.config_entity import InferenceTimingConfig
+
+PHASES = ("parse", "frame", "preprocess", "classifier", "decision", "serialize")
+
+_current_request: ContextVar[Optional["RequestPhases"]] = ContextVar("current_request_phases", default=None)
+
+
+class RequestPhases:
+    """
+    Exclusive phase durations of one request.
+
+    One phase is open at a time, starting with "parse" when the request
+    arrives; `enter` closes it and opens the next (or none). Phases reported
+    with `add` while another is open (e.g. the decision mapping inside
+    serialization) are subtracted from the open one, so durations never
+    overlap and add up to at most the total.
+    """
+
+    __slots__ = ("received_at", "durations", "_phase", "_since", "_nested")
+
+    def __init__(self, received_at: float):
+        self.received_at = received_at
+        self.durations: Dict[str, float] = {}
+        self._phase: Optional[str] = "parse"
+        self._since = received_at
+        self._nested = 0.0
+
+    def add(self, phase: str, seconds: float):
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+        self._nested += seconds
+
+    def enter(self, phase: Optional[str], now: float) -> Optional[Tuple[str, float]]:
+        """Closes the open phase and returns it as (phase, seconds), if one was open."""
+        closed = None
+        if self._phase is not None:
+            seconds = max(0.0, now - self._since - self._nested)
+            self.durations[self._phase] = self.durations.get(self._phase, 0.0) + seconds
+            closed = (self._phase, seconds)
+        self._phase, self._since, self._nested = phase, now, 0.0
+        return closed
+
+    def server_timing(self, now: float) -> str:
+        """Server-Timing header value, in milliseconds."""
+        entries = [f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in self.durations.items()]
+        entries.append(f"total;dur={(now - self.received_at) * 1000:.3f}")
+        return ", ".join(entries)
+
+
+class PhaseTimer:
+    """
+    Splits inference latency into phases: request parsing, DataFrame
+    construction, preprocessing, classifier, decision mapping and response
+    serialization.
+
+    Scoring code reports the phases it runs through `record` (the
+    PredictionPipeline / DecisionPolicy `on_phase` hook); each one goes to
+    `on_phase` and, when it ran in the context of a request opened by
+    PhaseTimingMiddleware, into that request's RequestPhases. Rows scored in
+    another context (a micro-batch flush, a process worker) still reach the
+    histograms, just not the request's Server-Timing header. Parsing and
+    serialization are the gaps between the middleware and the route, marked
+    by `enter`.
+    """
+
+    def __init__(self, config: InferenceTimingConfig, on_phase: Callable[[str, float], None]):
+        """
+        Args:
+            config: Whether to send the Server-Timing header
+            on_phase: Called with (phase, seconds) for every timed phase
+        """
+        self.config = config
+        self.on_phase = on_phase
+
+    def record(self, phase: str, seconds: float):
+        self.on_phase(phase, seconds)
+        request = _current_request.get()
+        if request is not None:
+            request.add(phase, seconds)
+
+    def enter(self, phase: Optional[str]):
+        """Closes the current request's open phase and opens `phase` (None: stop timing until the next one)."""
+        request = _current_request.get()
+        if request is None:
+            return
+        closed = request.enter(phase, time.perf_counter())
+        if closed is not None:
+            self.on_phase(*closed)
+
+
+class PhaseTimingMiddleware:
+    """
+    ASGI middleware that opens a RequestPhases for requests to `paths`, closes
+    it when the response starts and, if configured, sends it as a
+    Server-Timing header.
+    """
+
+    def __init__(self, app, timer: PhaseTimer, paths: Iterable[str]):
+        self.app = app
+        self.timer = timer
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        request = RequestPhases(time.perf_counter())
+        token = _current_request.set(request)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                closed = request.enter(None, now)
+                if closed is not None:
+                    self.timer.on_phase(*closed)
+                if self.timer.config.server_timing_header:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", request.server_timing(now).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_request.reset(token)
@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from customerSatisfaction import logger
+from customerSatisfaction.entity.config_entity import PredictionCacheConfig
+
+
+class PredictionCache:
+    """
+    Bounded LRU + TTL cache of satisfaction probabilities per canonical feature vector.
+
+    Keys hash the schema's inference features in a fixed order, so the same
+    order payload resent by upstream maps to the same entry regardless of JSON
+    key order or int/float formatting. Concurrent misses on one key share a
+    single computation, and the whole cache is dropped when the model changes.
+    """
+
+    def __init__(
+        self,
+        config: PredictionCacheConfig,
+        on_event: Optional[Callable[[str], None]] = None
+    ):
+        """
+        Args:
+            config: Size / TTL limits and the feature columns forming the key
+            on_event: Called with "hit", "miss", "eviction" or "invalidation"
+        """
+        self.config = config
+        self.on_event = on_event
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        self._model_version: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _emit(self, event: str, count: int = 1):
+        if self.on_event is not None:
+            for _ in range(count):
+                self.on_event(event)
+
+    def key(self, record: dict) -> bytes:
+        """Hashes the record's features in schema order with normalized numeric types."""
+        values = []
+        for column in self.config.feature_columns:
+            value = record[column]
+            values.append(value if isinstance(value, str) else float(value))
+        return hashlib.blake2b(repr(values).encode(), digest_size=16).digest()
+
+    def _check_version(self, model_version: str):
+        if model_version != self._model_version:
+            if self._entries:
+                logger.info(f"Prediction cache invalidated for model {model_version} ({len(self._entries)} entries)")
+                self._emit("invalidation")
+            self._entries.clear()
+            self._model_version = model_version
+
+    def _lookup(self, key: bytes) -> Optional[float]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._emit("eviction")
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: bytes, value: float):
+        self._entries[key] = (value, time.monotonic() + self.config.ttl_seconds)
+        self._entries.move_to_end(key)
+        evicted = 0
+        while len(self._entries) > self.config.max_entries:
+            self._entries.popitem(last=False)
+            evicted += 1
+        self._emit("eviction", evicted)
+
+    def lookup_many(self, records: List[dict], model_version: str) -> Tuple[List[bytes], List[Optional[Any]]]:
+        """
+        Batch lookup for callers that compute all misses in one vectorized call.
+
+        Returns:
+            (keys, values) with None for every miss; pass the keys back to store_many
+        """
+        self._check_version(model_version)
+        keys = [self.key(record) for record in records]
+        values = [self._lookup(key) for key in keys]
+        hits = sum(value is not None for value in values)
+        self._emit("hit", hits)
+        self._emit("miss", len(values) - hits)
+        return keys, values
+
+    def store_many(self, keys: List[bytes], values: List[Any], model_version: str):
+        """Caches values computed for keys from lookup_many, unless the model changed meanwhile."""
+        if model_version == self._model_version:
+            for key, value in zip(keys, values):
+                self._store(key, value)
+
+    async def get_or_compute(
+        self,
+        record: dict,
+        compute: Callable[[], Awaitable[float]],
+        model_version: str
+    ) -> float:
+        """
+        Returns the cached probability for the record, computing it at most once.
+
+        Args:
+            record: Raw request features
+            compute: Coroutine factory producing the probability on a miss
+            model_version: Version of the model that `compute` will use
+        """
+        self._check_version(model_version)
+        key = self.key(record)
+
+        # One hit or miss per call, emitted once the outcome is settled
+        while True:
+            value = self._lookup(key)
+            if value is not None:
+                self._emit("hit")
+                return value
+
+            # Single-flight: identical concurrent requests await the first computation
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            try:
+                value = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The first caller was cancelled, not this one: look again, computing it here if needed
+                continue
+            except BaseException:
+                self._emit("hit")
+                raise
+            self._emit("hit")
+            return value
+
+        self._emit("miss")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await compute()
+            # Only keep it if the model didn't change while we were computing
+            if model_version == self._model_version:
+                self._store(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            # Waiters see the cancellation and retry instead of hanging on the future
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unobserved failure doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
@@ -0,0 +1,177 @@
+import asyncio
+import importlib
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+import numpy as np
+from customerSatisfaction import logger
+from customerSatisfaction.entity.config_entity import PredictionLogConfig
+
+Payload = Union[List[dict], Dict[str, np.ndarray]]
+
+FILE_PREFIX = "predictions-"
+
+
+class PredictionLogger:
+    """
+    Persists every scored request (inference features, scores, order id, model
+    version) to Parquet without touching disk on the request path.
+
+    `log` only appends the already-validated payload to a bounded in-memory
+    buffer and never blocks: when `max_buffer_rows` are waiting, new rows are
+    dropped and counted. A background task writes the buffer to a new Parquet
+    file once `flush_rows` rows are waiting or `flush_interval_seconds` have
+    passed, in a thread, then deletes files beyond the retention limits.
+
+    Files are written under a temporary dot-name and renamed into place, so
+    `pd.read_parquet(config.dir)` only ever sees complete files. Feature
+    columns keep their schema names, so the directory reads like Stage 04's
+    engineered frame, minus the label.
+    """
+
+    def __init__(
+        self,
+        config: PredictionLogConfig,
+        on_rows: Optional[Callable[[str, int], None]] = None,
+        on_flush: Optional[Callable[[int, float], None]] = None
+    ):
+        """
+        Args:
+            config: Buffer, flush, retention limits and the feature columns to keep
+            on_rows: Called with ("written" | "dropped", number of rows)
+            on_flush: Called with (rows written, seconds spent writing) per file
+        """
+        self.config = config
+        self.on_rows = on_rows
+        self.on_flush = on_flush
+        self.buffered_rows = 0
+        self._buffer: list = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._parquet = None
+        self._arrow = None
+
+    async def start(self):
+        try:
+            self._arrow = importlib.import_module("pyarrow")
+            self._parquet = importlib.import_module("pyarrow.parquet")
+        except ImportError:
+            logger.warning("Prediction log disabled: 'pyarrow' is not installed on this server")
+            return
+        Path(self.config.dir).mkdir(parents=True, exist_ok=True)
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Prediction log started ({self.config.dir}, flush_rows={self.config.flush_rows}, "
+            f"flush_interval_seconds={self.config.flush_interval_seconds})"
+        )
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        # Whatever is still buffered goes to one last file
+        await self._flush()
+
+    def log(
+        self,
+        payload: Payload,
+        sat_probs: Sequence[float],
+        order_ids: Optional[Sequence[Optional[str]]] = None,
+        model_version: str = ""
+    ) -> bool:
+        """Buffers scored rows for the writer; returns False if they were dropped."""
+        if self._worker is None:
+            return False
+        n_rows = len(sat_probs)
+        if self.buffered_rows + n_rows > self.config.max_buffer_rows:
+            if self.on_rows is not None:
+                self.on_rows("dropped", n_rows)
+            return False
+        self._buffer.append((payload, np.asarray(sat_probs, dtype=np.float64), order_ids, model_version, time.time()))
+        self.buffered_rows += n_rows
+        if self.buffered_rows >= self.config.flush_rows:
+            self._wakeup.set()
+        return True
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.config.flush_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._flush()
+
+    async def _flush(self):
+        if not self._buffer:
+            return
+        batches, self._buffer, n_rows, self.buffered_rows = self._buffer, [], self.buffered_rows, 0
+        try:
+            start = time.perf_counter()
+            path = await asyncio.to_thread(self._write, batches)
+            elapsed = time.perf_counter() - start
+            await asyncio.to_thread(self._apply_retention)
+        except Exception as e:
+            logger.error(f"Prediction log flush of {n_rows} rows failed: {e}")
+            if self.on_rows is not None:
+                self.on_rows("dropped", n_rows)
+            return
+        if self.on_rows is not None:
+            self.on_rows("written", n_rows)
+        if self.on_flush is not None:
+            self.on_flush(n_rows, elapsed)
+        logger.debug("Prediction log wrote %d rows to %s", n_rows, path)
+
+    def _table(self, batches: list):
+        columns = {column: [] for column in self.config.feature_columns}
+        logged_at, versions, order_ids, sat_probs = [], [], [], []
+        for payload, probs, ids, model_version, timestamp in batches:
+            n_rows = len(probs)
+            for column in self.config.feature_columns:
+                if isinstance(payload, dict):
+                    columns[column].extend(np.asarray(payload[column]).tolist())
+                else:
+                    columns[column].extend(record[column] for record in payload)
+            logged_at.extend([int(timestamp * 1000)] * n_rows)
+            versions.extend([model_version] * n_rows)
+            order_ids.extend(ids if ids is not None else [None] * n_rows)
+            sat_probs.append(probs)
+
+        pa = self._arrow
+        sat_probs = np.concatenate(sat_probs)
+        return pa.table({
+            **columns,
+            "order_id": pa.array(order_ids, type=pa.string()),
+            "satisfaction_probability": sat_probs,
+            "churn_probability": 1.0 - sat_probs,
+            "model_version": pa.array(versions, type=pa.string()),
+            "logged_at": pa.array(logged_at, type=pa.timestamp("ms", tz="UTC"))
+        })
+
+    def _write(self, batches: list) -> Path:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        name = f"{FILE_PREFIX}{stamp}-{os.getpid()}.parquet"
+        path = Path(self.config.dir) / name
+        tmp_path = Path(self.config.dir) / f".{name}.tmp"
+        self._parquet.write_table(self._table(batches), tmp_path, compression=self.config.compression)
+        os.replace(tmp_path, path)
+        return path
+
+    def _apply_retention(self):
+        # Names start with a UTC timestamp, so name order is write order
+        files = sorted(Path(self.config.dir).glob(f"{FILE_PREFIX}*.parquet"))
+        cutoff = time.time() - self.config.retention_days * 86400
+        expired = files[:max(0, len(files) - self.config.retention_files)]
+        expired += [path for path in files[len(expired):] if path.stat().st_mtime < cutoff]
+        for path in expired:
+            path.unlink(missing_ok=True)
+        if expired:
+            logger.info(f"Prediction log retention removed {len(expired)} files")
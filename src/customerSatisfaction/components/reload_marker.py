@@ -0,0 +1,58 @@
+import fcntl
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+
+class ReloadMarker:
+    """
+    Shared file through which one serving worker tells the others about a
+    reload it just applied.
+
+    Every kind of reload ("model", "policy") has a generation number that
+    `publish` increments, along with whatever the other workers need to repeat
+    it (e.g. the exported model bundle). Workers poll `read` and apply every
+    generation newer than the last one they saw. Writers take an exclusive
+    lock, and the file is replaced atomically, so readers never see a partial
+    write.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._mtime_ns: Optional[int] = None
+        self._state: dict = {}
+
+    def clear(self):
+        """Forgets reloads from a previous deployment; run by the serving parent before workers start."""
+        self.path.unlink(missing_ok=True)
+
+    def read(self) -> dict:
+        """{kind: {"generation": n, ...}} for every published kind, re-read only when the file changed."""
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if mtime_ns != self._mtime_ns:
+            with open(self.path) as f:
+                self._state = json.load(f)
+            self._mtime_ns = mtime_ns
+        return self._state
+
+    def publish(self, kind: str, **fields) -> int:
+        """Records a reload of `kind` and returns its generation."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                with open(self.path) as f:
+                    state = json.load(f)
+            except FileNotFoundError:
+                state = {}
+            generation = state.get(kind, {}).get("generation", 0) + 1
+            state[kind] = {**fields, "generation": generation}
+            tmp_path = self.path.parent / f".{self.path.name}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        return generation
@@ -0,0 +1,124 @@
+import json
+from typing import Callable, List, Optional
+import numpy as np
+from customerSatisfaction.components.decision_policy import DecisionPolicy
+
+try:
+    # Optional: much faster than the stdlib for payloads that can't be templated
+    import orjson
+
+    def dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    def dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+# Same 4 decimals as round(x, 4), without a float round trip per field
+_NUMBER = "%.4f"
+
+
+def build_results(
+    policy: DecisionPolicy,
+    sat_probs: np.ndarray,
+    latency: float,
+    on_interpret: Optional[Callable[[np.ndarray], None]] = None
+) -> List[dict]:
+    """The per-row response dicts that ResponseEncoder reproduces value-for-value."""
+    sat_probs = np.asarray(sat_probs, dtype=np.float64)
+    tiers = policy.interpret(sat_probs)
+    if on_interpret is not None:
+        on_interpret(tiers["interpretation"])
+    latency = round(latency, 4)
+
+    return [
+        {
+            "status": "success",
+            "metadata": {
+                "interpretation": interpretation,
+                "recommended_action": action,
+                "risk_level": risk_level,
+                "alert_color": alert_color,
+                "latency_s": latency
+            },
+            "scores": {
+                "satisfaction_probability": round(p, 4),
+                "churn_probability": round(1 - p, 4)
+            }
+        }
+        for p, interpretation, action, risk_level, alert_color in zip(
+            sat_probs.tolist(), tiers["interpretation"], tiers["recommended_action"],
+            tiers["risk_level"], tiers["alert_color"]
+        )
+    ]
+
+
+class ResponseEncoder:
+    """
+    Encodes /predict and batch responses straight to JSON bytes.
+
+    Every (interpretation tier, risk tier) pair gets one pre-encoded template
+    when the encoder is built, so the constant strings are escaped once per
+    policy and a response only formats its three numbers into it. Batches
+    look tiers up for the whole probability array and format each numeric
+    column in one pass before joining the rows. Rebuild the encoder whenever
+    the policy changes.
+    """
+
+    def __init__(self, policy: DecisionPolicy, on_interpret: Optional[Callable[[np.ndarray], None]] = None):
+        """
+        Args:
+            policy: Tier tables the templates are built from
+            on_interpret: Called with the interpretation label of every encoded row
+        """
+        self.policy = policy
+        self.on_interpret = on_interpret
+        self._n_risk = len(policy.risk.columns["label"])
+
+        interpretation = policy.interpretation.columns
+        templates = []
+        for label, action, alert_color in zip(
+            interpretation["label"], interpretation["action"], interpretation["alert_color"]
+        ):
+            for risk_level in policy.risk.columns["label"]:
+                metadata = (
+                    f'{{"status":"success","metadata":{{"interpretation":{self._string(label)},'
+                    f'"recommended_action":{self._string(action)},"risk_level":{self._string(risk_level)},'
+                    f'"alert_color":{self._string(alert_color)},'
+                )
+                # %-escape the constants so only our three placeholders remain
+                templates.append(
+                    metadata.replace("%", "%%")
+                    + '"latency_s":%s},"scores":{"satisfaction_probability":%s,"churn_probability":%s}}'
+                )
+        self._templates = templates
+
+    @staticmethod
+    def _string(value: str) -> str:
+        return dumps(value).decode()
+
+    def _rows(self, sat_probs: np.ndarray, latency: float) -> List[str]:
+        sat_probs = np.asarray(sat_probs, dtype=np.float64)
+        tier, risk = self.policy.tier_indices(sat_probs)
+        if self.on_interpret is not None:
+            self.on_interpret(self.policy.interpretation.columns["label"][tier])
+
+        latency = _NUMBER % latency
+        templates = self._templates
+        satisfied = [_NUMBER % p for p in sat_probs.tolist()]
+        churn = [_NUMBER % p for p in (1.0 - sat_probs).tolist()]
+        return [
+            templates[k] % (latency, s, c)
+            for k, s, c in zip((tier * self._n_risk + risk).tolist(), satisfied, churn)
+        ]
+
+    def encode_one(self, sat_prob: float, latency: float) -> bytes:
+        """One /predict response."""
+        return self._rows([sat_prob], latency)[0].encode()
+
+    def encode_batch(self, sat_probs: np.ndarray, per_row_latency: float, latency: float) -> bytes:
+        """A /predict/batch response: the status envelope around one result per row."""
+        rows = self._rows(sat_probs, per_row_latency)
+        return (
+            f'{{"status":"success","count":{len(rows)},"latency_s":{_NUMBER % latency},"results":['
+            + ",".join(rows) + "]}"
+        ).encode()
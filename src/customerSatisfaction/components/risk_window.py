@@ -0,0 +1,129 @@
+import time
+from typing import Dict, Optional, Sequence
+import numpy as np
+from customerSatisfaction.entity.config_entity import RiskWindowConfig
+
+# Label for segment values seen after max_segment_values distinct ones
+OTHER = "__other__"
+
+# Columns of every bucket row
+ORDERS, AT_RISK, CHURN = 0, 1, 2
+
+
+class RiskWindow:
+    """
+    Rolling at-risk statistics per segment value (e.g. customer_state) over
+    the last few minutes, kept in fixed-size ring buffers.
+
+    Time is cut into `bucket_seconds` buckets, and a ring holds as many of them
+    as the longest window needs. Each bucket stores, per segment value, the
+    number of orders, how many were at risk and their summed churn probability.
+    Recording a prediction adds to the current bucket; a slot is zeroed when
+    the ring comes back round to it. Distinct values per segment are capped, so
+    memory is fixed up front whatever the traffic.
+    """
+
+    def __init__(self, config: RiskWindowConfig):
+        self.config = config
+        self.n_buckets = max(config.windows_minutes) * 60 // config.bucket_seconds
+        size = config.max_segment_values + 1
+        self._epoch = np.full(self.n_buckets, -1, dtype=np.int64)
+        self._totals = np.zeros((self.n_buckets, 3))
+        self._counts = {segment: np.zeros((self.n_buckets, size, 3)) for segment in config.segments}
+        self._index: Dict[str, Dict[str, int]] = {segment: {} for segment in config.segments}
+        self._names = {segment: [] for segment in config.segments}
+
+    def _slot(self, now: float) -> int:
+        bucket = int(now // self.config.bucket_seconds)
+        slot = bucket % self.n_buckets
+        if self._epoch[slot] != bucket:
+            # The slot still holds a bucket that has left every window
+            self._epoch[slot] = bucket
+            self._totals[slot] = 0.0
+            for counts in self._counts.values():
+                counts[slot] = 0.0
+        return slot
+
+    def _value_index(self, segment: str, value) -> int:
+        index = self._index[segment]
+        value = str(value)
+        position = index.get(value)
+        if position is None:
+            if len(index) >= self.config.max_segment_values:
+                return self.config.max_segment_values
+            position = index[value] = len(index)
+            self._names[segment].append(value)
+        return position
+
+    def record(
+        self,
+        segments: Dict[str, Sequence],
+        churn_probs: np.ndarray,
+        at_risk: np.ndarray,
+        now: Optional[float] = None
+    ):
+        """
+        Adds scored orders to the current bucket.
+
+        Args:
+            segments: {segment: value per order} for every configured segment
+            churn_probs: P(Unsatisfied) per order
+            at_risk: Whether each order's tier counts as at risk
+        """
+        rows = np.column_stack([
+            np.ones(len(churn_probs)), np.asarray(at_risk, dtype=np.float64), np.asarray(churn_probs, dtype=np.float64)
+        ])
+        slot = self._slot(time.monotonic() if now is None else now)
+        self._totals[slot] += rows.sum(axis=0)
+        for segment, counts in self._counts.items():
+            positions = [self._value_index(segment, value) for value in segments[segment]]
+            if len(positions) == 1:
+                counts[slot, positions[0]] += rows[0]
+            else:
+                # Unbuffered, so repeated values in one batch all count
+                np.add.at(counts[slot], positions, rows)
+
+    @staticmethod
+    def _summary(row: np.ndarray) -> dict:
+        orders = int(row[ORDERS])
+        return {
+            "orders": orders,
+            "at_risk": int(row[AT_RISK]),
+            "at_risk_share": round(float(row[AT_RISK]) / orders, 4) if orders else 0.0,
+            "mean_churn_probability": round(float(row[CHURN]) / orders, 4) if orders else 0.0
+        }
+
+    def stats(
+        self,
+        window_minutes: int,
+        segment: Optional[str] = None,
+        min_orders: int = 1,
+        now: Optional[float] = None
+    ) -> dict:
+        """
+        Aggregates the buckets inside the window ending now.
+
+        Args:
+            window_minutes: Window length, at most the longest configured window
+            segment: Only report this segment (default: all configured segments)
+            min_orders: Leave out segment values with fewer orders in the window
+        Returns:
+            Overall summary plus, per segment, one summary per value, highest
+            at-risk share first
+        """
+        current = int((time.monotonic() if now is None else now) // self.config.bucket_seconds)
+        span = window_minutes * 60 // self.config.bucket_seconds
+        live = (self._epoch > current - span) & (self._epoch <= current)
+
+        result = {"window_minutes": window_minutes, **self._summary(self._totals[live].sum(axis=0))}
+        result["segments"] = {}
+        for name in ([segment] if segment else self.config.segments):
+            totals = self._counts[name][live].sum(axis=0)
+            labels = self._names[name] + [None] * (self.config.max_segment_values - len(self._names[name])) + [OTHER]
+            values = [
+                {"value": label, **self._summary(row)}
+                for label, row in zip(labels, totals)
+                if row[ORDERS] >= max(min_orders, 1)
+            ]
+            result["segments"][name] = sorted(values, key=lambda v: (-v["at_risk_share"], -v["orders"]))
+        return result
@@ -0,0 +1,122 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+import numpy as np
+from customerSatisfaction import logger
+from customerSatisfaction.entity.config_entity import ShadowConfig
+
+Payload = Union[List[dict], Dict[str, np.ndarray]]
+
+
+class ShadowScorer:
+    """
+    Replays a sample of live traffic against a challenger model off the request path.
+
+    Routes hand over their already-validated input together with the champion's
+    P(Satisfied) via `offer`, which never blocks: unsampled requests are ignored
+    and sampled ones are dropped when the bounded queue is full. A single
+    background task drains the queue, scores queued rows with the challenger
+    through `run_in` (or a dedicated one-thread pool), and reports how the two
+    models compare. Only one challenger call runs at a time.
+    """
+
+    def __init__(
+        self,
+        config: ShadowConfig,
+        on_compare: Optional[Callable[[np.ndarray, np.ndarray, float], None]] = None,
+        on_drop: Optional[Callable[[int], None]] = None,
+        run_in: Optional[Callable[[Callable, object, Payload], Awaitable[np.ndarray]]] = None
+    ):
+        """
+        Args:
+            config: Sample rate and queue / batch limits
+            on_compare: Called with (champion P(Satisfied), challenger P(Satisfied), challenger seconds)
+            on_drop: Called with the number of sampled rows dropped on a full queue
+            run_in: Awaits fn(challenger, payload) on a bounded pool (e.g. InferenceExecutor.run_with_pipeline)
+        """
+        self.config = config
+        self.on_compare = on_compare
+        self.on_drop = on_drop
+        self.run_in = run_in
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.challenger = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._pending = None
+
+    def qsize(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.config.queue_size)
+        if self.run_in is None:
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow")
+        self._worker = asyncio.create_task(self._run())
+        logger.info(f"Shadow scoring started (sample_rate={self.config.sample_rate}, queue_size={self.config.queue_size})")
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def offer(self, payload: Payload, champion_probs):
+        """Queues a sampled request for the challenger; returns immediately either way."""
+        if self.challenger is None or self._queue is None or random.random() >= self.config.sample_rate:
+            return
+        try:
+            self._queue.put_nowait((payload, np.asarray(champion_probs, dtype=np.float64)))
+        except asyncio.QueueFull:
+            if self.on_drop is not None:
+                self.on_drop(len(champion_probs))
+
+    @staticmethod
+    def _score(challenger, payload: Payload) -> np.ndarray:
+        if isinstance(payload, dict):
+            return challenger.predict_columns(payload)[:, 1]
+        return challenger.predict_records(payload)[:, 1]
+
+    async def _next_batch(self):
+        # Merge record batches that are already waiting into one challenger call
+        item, self._pending = self._pending or await self._queue.get(), None
+        payload, champion = item
+        if isinstance(payload, dict):
+            return payload, champion
+
+        rows, probs = list(payload), [champion]
+        while len(rows) < self.config.max_batch_size and not self._queue.empty():
+            item = self._queue.get_nowait()
+            if isinstance(item[0], dict):
+                # Columnar batches are scored on their own, next round
+                self._pending = item
+                break
+            rows.extend(item[0])
+            probs.append(item[1])
+        return rows, np.concatenate(probs)
+
+    async def _run(self):
+        while True:
+            payload, champion = await self._next_batch()
+            challenger = self.challenger
+            try:
+                start = time.perf_counter()
+                if self.run_in is not None:
+                    probs = await self.run_in(self._score, challenger, payload)
+                else:
+                    probs = await asyncio.get_running_loop().run_in_executor(
+                        self._pool, self._score, challenger, payload
+                    )
+                elapsed = time.perf_counter() - start
+            except Exception as e:
+                logger.warning("Shadow scoring of %d rows failed: %s", len(champion), e)
+                continue
+            if self.on_compare is not None:
+                self.on_compare(champion, np.asarray(probs, dtype=np.float64), elapsed)
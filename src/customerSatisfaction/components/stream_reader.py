@@ -0,0 +1,87 @@
+import csv
+import json
+from typing import AsyncIterator, List, Tuple, Union
+from starlette.responses import StreamingResponse
+from customerSatisfaction.entity.config_entity import StreamingConfig
+
+NDJSON = "ndjson"
+CSV = "csv"
+
+
+class StreamReader:
+    """
+    Incrementally decodes an NDJSON or CSV request body into fixed-size chunks.
+
+    Only the current partial line and one chunk of rows are held in memory,
+    so the body can be arbitrarily large.
+    """
+
+    def __init__(self, config: StreamingConfig, fmt: str = NDJSON):
+        if fmt not in (NDJSON, CSV):
+            raise ValueError(f"Unsupported stream format '{fmt}'")
+        self.config = config
+        self.fmt = fmt
+
+    async def lines(self, body: AsyncIterator[bytes]) -> AsyncIterator[str]:
+        """Splits raw body bytes into non-empty text lines."""
+        buffer = b""
+        async for data in body:
+            buffer += data
+            *complete, buffer = buffer.split(b"\n")
+            if len(buffer) > self.config.max_line_bytes:
+                raise ValueError(f"Line exceeds {self.config.max_line_bytes} bytes")
+            for line in complete:
+                line = line.strip()
+                if line:
+                    yield line.decode("utf-8")
+        if buffer.strip():
+            yield buffer.strip().decode("utf-8")
+
+    async def rows(self, body: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Union[dict, Exception]]]:
+        """Yields (row_number, record) pairs, or (row_number, error) for lines that can't be decoded."""
+        header = None
+        row = 0
+        async for line in self.lines(body):
+            if self.fmt == CSV and header is None:
+                header = next(csv.reader([line]))
+                continue
+            try:
+                if self.fmt == NDJSON:
+                    record = json.loads(line)
+                    if not isinstance(record, dict):
+                        raise ValueError("Each NDJSON line must be a JSON object")
+                else:
+                    values = next(csv.reader([line]))
+                    if len(values) != len(header):
+                        raise ValueError(f"Expected {len(header)} CSV fields, got {len(values)}")
+                    record = dict(zip(header, values))
+                yield row, record
+            except Exception as e:
+                yield row, e
+            row += 1
+
+    async def chunks(self, body: AsyncIterator[bytes]) -> AsyncIterator[List[Tuple[int, Union[dict, Exception]]]]:
+        """Groups decoded rows into lists of at most `chunk_size`."""
+        chunk = []
+        async for item in self.rows(body):
+            chunk.append(item)
+            if len(chunk) >= self.config.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that can be sent while the request body is still being read.
+
+    Starlette's default listens on `receive` for a disconnect while streaming,
+    which swallows the body messages the generator is consuming. A client that
+    goes away instead surfaces as a failed send.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,122 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+from threadpoolctl import threadpool_limits
+from customerSatisfaction import logger
+from customerSatisfaction.entity.config_entity import ThreadBudgetConfig
+
+# Exported by ThreadBudget.apply; forked executor workers and uvicorn workers inherit them
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMEXPR_NUM_THREADS")
+
+# Set only by ThreadBudget.apply, so an OMP_NUM_THREADS set outside the budget never caps model n_jobs
+BUDGET_ENV_VAR = "THREAD_BUDGET_INTRA_OP_THREADS"
+
+# Estimator parameters that control a model's own thread pool
+THREAD_PARAMS = ("n_jobs", "thread_count")
+
+
+@dataclass(frozen=True)
+class ThreadAllocation:
+    cores: int              # Core budget being divided
+    workers: int            # uvicorn worker processes (1 for training)
+    executor_threads: int   # Concurrent scoring calls per worker
+    intra_op_threads: int   # BLAS/OpenMP and model n_jobs/thread_count per call
+
+    def as_dict(self) -> dict:
+        return {
+            "cores": self.cores,
+            "workers": self.workers,
+            "executor_threads": self.executor_threads,
+            "intra_op_threads": self.intra_op_threads
+        }
+
+
+def available_cores() -> int:
+    """Cores this process may run on (CPU affinity, e.g. a cgroup cpuset), else the machine's count."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def intra_op_threads() -> Optional[int]:
+    """Per-call thread limit exported by ThreadBudget.apply in this or a parent process, if any."""
+    value = os.environ.get(BUDGET_ENV_VAR)
+    return int(value) if value and value.isdigit() else None
+
+
+def thread_params(estimator) -> list:
+    """Which of THREAD_PARAMS an estimator (instance or class) accepts."""
+    # CatBoost's get_params only lists explicitly set params
+    if type(estimator).__name__.startswith("CatBoost") or getattr(estimator, "__name__", "").startswith("CatBoost"):
+        return ["thread_count"]
+    if isinstance(estimator, type):
+        estimator = estimator()
+    params = estimator.get_params(deep=False) if hasattr(estimator, "get_params") else {}
+    return [name for name in THREAD_PARAMS if name in params]
+
+
+def limit_estimator(estimator, threads: int) -> int:
+    """
+    Sets n_jobs / thread_count on the estimator and everything nested in it
+    (Pipeline steps, cascade stages). Returns how many estimators were changed.
+    """
+    changed = 0
+    updates = {name: threads for name in thread_params(estimator)}
+    if updates:
+        estimator.set_params(**updates)
+        changed += 1
+
+    nested = [step for _, step in getattr(estimator, "steps", [])]
+    nested += [getattr(estimator, name) for name in ("first_stage", "champion") if hasattr(estimator, name)]
+    for child in nested:
+        changed += limit_estimator(child, threads)
+    return changed
+
+
+class ThreadBudget:
+    """
+    Divides one core budget between everything that spins up threads, so
+    uvicorn workers x executor threads x per-call threads never exceeds it.
+
+    Serving gives each worker an equal share, caps the inference executor at
+    that share and splits what is left per scoring call; training runs one
+    model at a time with the whole budget. `apply` pins BLAS/OpenMP and
+    exports the limit so child processes and freshly loaded models follow it.
+    """
+
+    def __init__(self, config: ThreadBudgetConfig):
+        self.config = config
+        self.cores = config.cores if config.cores > 0 else available_cores()
+
+    def for_serving(self, workers: int, executor_workers: int) -> ThreadAllocation:
+        if workers > self.cores:
+            logger.warning(f"{workers} workers exceed the {self.cores}-core thread budget, capping at {self.cores}")
+            workers = self.cores
+        per_worker = max(1, self.cores // workers)
+        executor_threads = max(1, min(executor_workers, per_worker))
+        return ThreadAllocation(
+            cores=self.cores,
+            workers=workers,
+            executor_threads=executor_threads,
+            intra_op_threads=max(1, per_worker // executor_threads)
+        )
+
+    def for_training(self) -> ThreadAllocation:
+        return ThreadAllocation(cores=self.cores, workers=1, executor_threads=1, intra_op_threads=self.cores)
+
+    def training_params(self, model_class: type, params: dict) -> dict:
+        """
+        Model params with n_jobs / thread_count set to the training budget,
+        unless params.yaml pins them explicitly.
+        """
+        threads = self.for_training().intra_op_threads
+        return {**{name: threads for name in thread_params(model_class)}, **params}
+
+    @staticmethod
+    def apply(allocation: ThreadAllocation, label: str):
+        """Limits BLAS/OpenMP pools in this process and exports the limit to child processes."""
+        for name in THREAD_ENV_VARS + (BUDGET_ENV_VAR,):
+            os.environ[name] = str(allocation.intra_op_threads)
+        threadpool_limits(limits=allocation.intra_op_threads)
+        logger.info(f"Thread budget ({label}): {allocation.as_dict()}")
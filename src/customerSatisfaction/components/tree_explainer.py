@@ -0,0 +1,126 @@
+from typing import List, Tuple
+import numpy as np
+from scipy import sparse
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from customerSatisfaction.components.compiled_forest import CompiledForest
+from customerSatisfaction.components.compiled_transformer import CompiledTransformer
+from customerSatisfaction.components.model_cascade import CascadeClassifier
+
+
+class UnsupportedModelError(ValueError):
+    """The served classifier has no tree contribution method."""
+
+
+def _path_deltas(tree, values: np.ndarray, n_features: int) -> sparse.csr_matrix:
+    """
+    (n_nodes, n_features) matrix holding, on each child node's row, the change in
+    node value caused by its parent's split, in the column of the split feature.
+    Summing the rows of a decision path gives that row's per-feature contributions.
+    """
+    parents = np.full(tree.node_count, -1)
+    internal = np.flatnonzero(tree.children_left >= 0)
+    parents[tree.children_left[internal]] = internal
+    parents[tree.children_right[internal]] = internal
+
+    children = np.flatnonzero(parents >= 0)
+    return sparse.csr_matrix(
+        (values[children] - values[parents[children]], (children, tree.feature[parents[children]])),
+        shape=(tree.node_count, n_features)
+    )
+
+
+class TreeExplainer:
+    """
+    Per-feature contributions to P(Satisfied) for tree champions, computed for
+    a whole batch at once with each library's own attribution:
+
+    - RandomForest: path contributions (change in class-1 probability at every
+      split a row passes through), averaged over trees, in probability units
+    - GradientBoosting: the same over the boosting stages, in log-odds units
+    - CatBoost: `get_feature_importance(type="ShapValues")`, in log-odds units
+
+    One-hot columns are summed back onto their source feature, so the result
+    has one column per raw inference feature. Cascades are explained through
+    their champion, compiled forests through the estimator they replay.
+    """
+
+    def __init__(self, classifier, compiled: CompiledTransformer):
+        """
+        Raises:
+            UnsupportedModelError: If the classifier is not a supported tree ensemble
+        """
+        if isinstance(classifier, CascadeClassifier):
+            classifier = classifier.champion
+        if isinstance(classifier, CompiledForest):
+            classifier = classifier.estimator
+        self.classifier = classifier
+        self.feature_names, self._to_raw = self._raw_feature_map(compiled)
+
+        if isinstance(classifier, RandomForestClassifier):
+            self.units = "probability"
+            positive = list(classifier.classes_).index(1)
+            deltas = []
+            for estimator in classifier.estimators_:
+                value = estimator.tree_.value[:, 0, :]
+                value = value[:, positive] / value.sum(axis=1)
+                deltas.append(_path_deltas(estimator.tree_, value, compiled.n_features_out))
+            # forest.decision_path concatenates every tree's nodes in estimator order
+            self._deltas = (sparse.vstack(deltas) @ self._to_raw) / len(deltas)
+        elif isinstance(classifier, GradientBoostingClassifier):
+            if classifier.estimators_.shape[1] != 1:
+                raise UnsupportedModelError("Only binary GradientBoostingClassifier models can be explained")
+            self.units = "log_odds"
+            self._deltas = [
+                (_path_deltas(tree.tree_, tree.tree_.value[:, 0, 0], compiled.n_features_out)
+                 @ self._to_raw) * classifier.learning_rate
+                for tree in classifier.estimators_[:, 0]
+            ]
+        elif type(classifier).__name__ == "CatBoostClassifier":
+            self.units = "log_odds"
+        else:
+            raise UnsupportedModelError(
+                f"Explanations need a RandomForest, GradientBoosting or CatBoost champion, got {type(classifier).__name__}"
+            )
+
+    @staticmethod
+    def _raw_feature_map(compiled: CompiledTransformer) -> Tuple[List[str], sparse.csr_matrix]:
+        """Raw feature names and the (n_features_out, n_raw) 0/1 matrix folding model columns onto them."""
+        names, rows, cols = [], [], []
+        for columns, offset, _, _ in compiled.numeric_blocks:
+            for i, column in enumerate(columns):
+                rows.append(offset + i)
+                cols.append(len(names))
+                names.append(column)
+        for column, index, _ in compiled.categorical_blocks:
+            rows.extend(index.values())
+            cols.extend([len(names)] * len(index))
+            names.append(column)
+        to_raw = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(compiled.n_features_out, len(names))
+        )
+        return names, to_raw
+
+    def explain(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Args:
+            features: Transformed model input, one row per order
+        Returns:
+            (contributions of shape (n_rows, len(feature_names)), base value per row);
+            base + contributions.sum(axis=1) is the model output in `units`
+        """
+        classifier = self.classifier
+        if self.units == "probability":
+            paths, _ = classifier.decision_path(features)
+            contributions = (paths @ self._deltas).toarray()
+            output = classifier.predict_proba(features)[:, list(classifier.classes_).index(1)]
+        elif isinstance(classifier, GradientBoostingClassifier):
+            contributions = np.zeros((len(features), len(self.feature_names)))
+            for tree, deltas in zip(classifier.estimators_[:, 0], self._deltas):
+                contributions += (tree.decision_path(features) @ deltas).toarray()
+            output = classifier.decision_function(features)
+        else:
+            from catboost import Pool
+            shap = classifier.get_feature_importance(data=Pool(features), type="ShapValues")
+            # Last column is the expected value
+            return np.asarray(shap[:, :-1] @ self._to_raw), shap[:, -1]
+        return contributions, output - contributions.sum(axis=1)
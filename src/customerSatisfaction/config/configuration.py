@@ -7,7 +7,29 @@ from customerSatisfaction.entity.config_entity import (
     FeatureEngineeringConfig,
     FeatureTransformationConfig,
     ModelTrainingConfig,
-    ModelEvaluationConfig
+    ModelEvaluationConfig,
+    DecisionPolicyConfig,
+    CascadeCalibrationConfig,
+    MicroBatchingConfig,
+    InferenceExecutorConfig,
+    PredictionCacheConfig,
+    ServingConfig,
+    ModelRegistryConfig,
+    ModelReloadConfig,
+    StreamingConfig,
+    ColumnarBatchConfig,
+    ResponseEncodingConfig,
+    AdmissionControlConfig,
+    ModelCascadeConfig,
+    ExplanationConfig,
+    ShadowConfig,
+    ThreadBudgetConfig,
+    ForestEngineConfig,
+    RiskWindowConfig,
+    AtRiskQueueConfig,
+    DriftMonitorConfig,
+    PredictionLogConfig,
+    InferenceTimingConfig
 )
 
 class ConfigurationManager:
@@ -84,6 +106,13 @@ class ConfigurationManager:
             transformer_path=Path(config.transformer_path),
             transformed_train_path=Path(config.transformed_train_path),
             transformed_test_path=Path(config.transformed_test_path),
+            drift_reference_path=Path(config.drift_reference_path),
+            drift_bins=int(config.drift_bins),
+            drift_max_categories=int(config.drift_max_categories),
+            inference_features={
+                "numerical": list(self.schema.inference_features.numerical),
+                "categorical": list(self.schema.inference_features.categorical)
+            },
             test_size=config.test_size,
             random_state=config.random_state
         )
@@ -104,7 +133,8 @@ class ConfigurationManager:
             model_name=config.model_name,
             model_path=Path(config.model_path),
             all_params=model_params,
-            target_column=target_col
+            target_column=target_col,
+            thread_budget=self.get_thread_budget_config()
         )
     
     
@@ -125,7 +155,282 @@ class ConfigurationManager:
             all_params=all_params,
             metric_file_name=Path(config.metric_file_name),
             target_column=config.target_column,
-            mlflow_uri=config.mlflow_uri
+            mlflow_uri=config.mlflow_uri,
+            decision_policy=self.get_decision_policy_config(),
+            cascade=self.get_cascade_calibration_config()
         )
 
-        return model_evaluation_config
\ No newline at end of file
+        return model_evaluation_config
+
+    def get_decision_policy_config(self) -> DecisionPolicyConfig:
+        params = self.params.decision_policy
+
+        return DecisionPolicyConfig(
+            unsatisfied_threshold=float(params.unsatisfied_threshold),
+            interpretation_tiers=[dict(tier) for tier in params.interpretation],
+            risk_tiers=[dict(tier) for tier in params.risk_level]
+        )
+
+    def get_cascade_calibration_config(self) -> CascadeCalibrationConfig:
+        params = self.params.cascade
+
+        if params.first_stage_model not in self.params.models:
+            raise ValueError(f"cascade.first_stage_model '{params.first_stage_model}' is not one of params.models")
+        if not 0.0 <= float(params.agreement_tolerance) < 1.0:
+            raise ValueError(f"cascade.agreement_tolerance must be in [0, 1), got {params.agreement_tolerance}")
+
+        return CascadeCalibrationConfig(
+            enabled=bool(params.enabled),
+            first_stage_model=str(params.first_stage_model),
+            agreement_tolerance=float(params.agreement_tolerance)
+        )
+
+    # ---------------- SERVING ---------------- #
+    def get_micro_batching_config(self) -> MicroBatchingConfig:
+        config = self.config.micro_batching
+
+        return MicroBatchingConfig(
+            enabled=bool(config.enabled),
+            max_batch_size=int(config.max_batch_size),
+            max_wait_ms=float(config.max_wait_ms)
+        )
+
+    def get_inference_executor_config(self) -> InferenceExecutorConfig:
+        config = self.config.inference_executor
+
+        if config.kind not in ("thread", "process"):
+            raise ValueError(f"inference_executor.kind must be 'thread' or 'process', got '{config.kind}'")
+
+        return InferenceExecutorConfig(
+            enabled=bool(config.enabled),
+            kind=str(config.kind),
+            max_workers=int(config.max_workers)
+        )
+
+    def get_prediction_cache_config(self) -> PredictionCacheConfig:
+        config = self.config.prediction_cache
+        features = self.schema.inference_features
+
+        return PredictionCacheConfig(
+            enabled=bool(config.enabled),
+            max_entries=int(config.max_entries),
+            ttl_seconds=float(config.ttl_seconds),
+            feature_columns=list(features.numerical) + list(features.categorical)
+        )
+
+    def get_serving_config(self) -> ServingConfig:
+        config = self.config.serving
+
+        return ServingConfig(
+            host=str(config.host),
+            port=int(config.port),
+            workers=int(config.workers),
+            model_bundle_dir=Path(config.model_bundle_dir),
+            metrics_dir=Path(config.metrics_dir)
+        )
+
+    def get_model_registry_config(self) -> ModelRegistryConfig:
+        config = self.config.model_registry
+
+        create_directories([config.cache_dir])
+
+        return ModelRegistryConfig(
+            model_name=str(config.model_name),
+            stage=str(config.stage),
+            cache_dir=Path(config.cache_dir)
+        )
+
+    def get_model_reload_config(self) -> ModelReloadConfig:
+        config = self.config.model_reload
+
+        if float(config.sync_interval_seconds) <= 0:
+            raise ValueError("model_reload.sync_interval_seconds must be positive")
+
+        return ModelReloadConfig(
+            poll_interval_seconds=float(config.poll_interval_seconds),
+            admin_token_env=str(config.admin_token_env),
+            sync_interval_seconds=float(config.sync_interval_seconds)
+        )
+
+    def get_streaming_config(self) -> StreamingConfig:
+        config = self.config.streaming
+
+        return StreamingConfig(
+            chunk_size=int(config.chunk_size),
+            max_line_bytes=int(config.max_line_bytes)
+        )
+
+    def get_columnar_batch_config(self) -> ColumnarBatchConfig:
+        config = self.config.columnar_batch
+        features = self.schema.inference_features
+        validation = self.schema.inference_validation
+
+        if float(config.max_body_mb) <= 0:
+            raise ValueError(f"columnar_batch.max_body_mb must be positive, got {config.max_body_mb}")
+
+        return ColumnarBatchConfig(
+            max_rows=int(config.max_rows),
+            max_body_bytes=int(float(config.max_body_mb) * 1024 * 1024),
+            numerical_features=list(features.numerical),
+            categorical_features=list(features.categorical),
+            integer_features=list(validation.integer),
+            ranges={column: (float(low), float(high)) for column, (low, high) in validation.ranges.items()}
+        )
+
+    def get_response_encoding_config(self) -> ResponseEncodingConfig:
+        config = self.config.response_encoding
+
+        return ResponseEncodingConfig(
+            enabled=bool(config.enabled)
+        )
+
+    def get_admission_control_config(self) -> AdmissionControlConfig:
+        config = self.config.admission_control
+
+        if int(config.status_code) not in (429, 503):
+            raise ValueError(f"admission_control.status_code must be 429 or 503, got {config.status_code}")
+
+        return AdmissionControlConfig(
+            enabled=bool(config.enabled),
+            max_concurrent=int(config.max_concurrent),
+            max_queue=int(config.max_queue),
+            deadline_ms=float(config.deadline_ms),
+            status_code=int(config.status_code),
+            retry_after_seconds=int(config.retry_after_seconds)
+        )
+
+    def get_model_cascade_config(self) -> ModelCascadeConfig:
+        config = self.config.model_cascade
+
+        return ModelCascadeConfig(
+            enabled=bool(config.enabled)
+        )
+
+    def get_explanation_config(self) -> ExplanationConfig:
+        config = self.config.explanations
+        features = self.schema.inference_features
+
+        return ExplanationConfig(
+            enabled=bool(config.enabled),
+            max_batch_size=int(config.max_batch_size),
+            top_k=int(config.top_k),
+            cache=PredictionCacheConfig(
+                enabled=bool(config.cache_max_entries > 0),
+                max_entries=int(config.cache_max_entries),
+                ttl_seconds=float(config.cache_ttl_seconds),
+                feature_columns=list(features.numerical) + list(features.categorical)
+            )
+        )
+
+    def get_shadow_config(self) -> ShadowConfig:
+        config = self.config.shadow
+
+        if not 0.0 <= float(config.sample_rate) <= 1.0:
+            raise ValueError(f"shadow.sample_rate must be in [0, 1], got {config.sample_rate}")
+
+        return ShadowConfig(
+            enabled=bool(config.enabled),
+            challenger_stage=str(config.challenger_stage),
+            sample_rate=float(config.sample_rate),
+            queue_size=int(config.queue_size),
+            max_batch_size=int(config.max_batch_size)
+        )
+
+    def get_thread_budget_config(self) -> ThreadBudgetConfig:
+        config = self.config.thread_budget
+
+        return ThreadBudgetConfig(
+            enabled=bool(config.enabled),
+            cores=int(config.cores)
+        )
+
+    def get_forest_engine_config(self) -> ForestEngineConfig:
+        config = self.config.forest_engine
+
+        if config.engine not in ("compiled", "sklearn"):
+            raise ValueError(f"forest_engine.engine must be 'compiled' or 'sklearn', got {config.engine}")
+
+        return ForestEngineConfig(
+            engine=str(config.engine)
+        )
+
+    def get_risk_window_config(self) -> RiskWindowConfig:
+        config = self.config.risk_window
+        categorical = list(self.schema.inference_features.categorical)
+
+        unknown = [segment for segment in config.segments if segment not in categorical]
+        if unknown:
+            raise ValueError(f"risk_window.segments must be categorical inference features, got {unknown}")
+        if any(int(window) * 60 % int(config.bucket_seconds) for window in config.windows_minutes):
+            raise ValueError("risk_window.windows_minutes must be whole multiples of bucket_seconds")
+
+        return RiskWindowConfig(
+            enabled=bool(config.enabled),
+            bucket_seconds=int(config.bucket_seconds),
+            windows_minutes=sorted(int(window) for window in config.windows_minutes),
+            segments=list(config.segments),
+            max_segment_values=int(config.max_segment_values),
+            alert_color=str(config.alert_color)
+        )
+
+    def get_at_risk_queue_config(self) -> AtRiskQueueConfig:
+        config = self.config.at_risk_queue
+        categorical = list(self.schema.inference_features.categorical)
+
+        unknown = [segment for segment in config.segments if segment not in categorical]
+        if unknown:
+            raise ValueError(f"at_risk_queue.segments must be categorical inference features, got {unknown}")
+        if int(config.capacity) < 1:
+            raise ValueError(f"at_risk_queue.capacity must be positive, got {config.capacity}")
+        if float(config.sync_interval_seconds) <= 0:
+            raise ValueError(f"at_risk_queue.sync_interval_seconds must be positive, got {config.sync_interval_seconds}")
+
+        return AtRiskQueueConfig(
+            enabled=bool(config.enabled),
+            capacity=int(config.capacity),
+            min_churn_probability=float(config.min_churn_probability),
+            segments=list(config.segments),
+            shared_dir=Path(config.shared_dir),
+            sync_interval_seconds=float(config.sync_interval_seconds)
+        )
+
+    def get_drift_monitor_config(self) -> DriftMonitorConfig:
+        config = self.config.drift_monitor
+
+        if not 0.0 <= float(config.decay) < 1.0:
+            raise ValueError(f"drift_monitor.decay must be in [0, 1), got {config.decay}")
+
+        return DriftMonitorConfig(
+            enabled=bool(config.enabled),
+            reference_path=Path(config.reference_path),
+            publish_interval_seconds=float(config.publish_interval_seconds),
+            min_rows=int(config.min_rows),
+            decay=float(config.decay)
+        )
+
+    def get_prediction_log_config(self) -> PredictionLogConfig:
+        config = self.config.prediction_log
+        features = self.schema.inference_features
+
+        if int(config.flush_rows) > int(config.max_buffer_rows):
+            raise ValueError("prediction_log.flush_rows must not exceed max_buffer_rows")
+
+        return PredictionLogConfig(
+            enabled=bool(config.enabled),
+            dir=Path(config.dir),
+            max_buffer_rows=int(config.max_buffer_rows),
+            flush_rows=int(config.flush_rows),
+            flush_interval_seconds=float(config.flush_interval_seconds),
+            retention_files=int(config.retention_files),
+            retention_days=float(config.retention_days),
+            compression=str(config.compression),
+            feature_columns=list(features.numerical) + list(features.categorical)
+        )
+
+    def get_inference_timing_config(self) -> InferenceTimingConfig:
+        config = self.config.inference_timing
+
+        return InferenceTimingConfig(
+            enabled=bool(config.enabled),
+            server_timing_header=bool(config.server_timing_header)
+        )
@@ -40,6 +40,10 @@ class FeatureTransformationConfig:
     transformer_path: Path
     transformed_train_path: Path
     transformed_test_path: Path
+    drift_reference_path: Path
+    drift_bins: int
+    drift_max_categories: int
+    inference_features: dict   # {"numerical": [...], "categorical": [...]} from schema.yaml
     test_size: float
     random_state: int
 
@@ -55,6 +59,23 @@ class ModelTrainingConfig:
     all_params: dict
     target_column: str    # <--- YOU MUST ADD THIS LINE HERE
     mlflow_uri: str = None  # Optional: Add MLflow URI for tracking
+    thread_budget: "ThreadBudgetConfig" = None  # n_jobs / thread_count and BLAS limits while training
+
+# ---------------- DECISION POLICY ---------------- #
+@dataclass(frozen=True)
+class DecisionPolicyConfig:
+    unsatisfied_threshold: float
+    interpretation_tiers: list   # [{min, label, action, alert_color}], ascending
+    risk_tiers: list             # [{min, label}], ascending
+
+
+# ---------------- MODEL CASCADE ---------------- #
+@dataclass(frozen=True)
+class CascadeCalibrationConfig:
+    enabled: bool
+    first_stage_model: str
+    agreement_tolerance: float
+
 
 # ---------------- MODEL EVALUATION ---------------- #
 @dataclass(frozen=True)
@@ -66,3 +87,163 @@ class ModelEvaluationConfig:
     metric_file_name: Path
     target_column: str
     mlflow_uri: str  # 
+    decision_policy: DecisionPolicyConfig
+    cascade: CascadeCalibrationConfig
+
+
+# ---------------- SERVING ---------------- #
+@dataclass(frozen=True)
+class MicroBatchingConfig:
+    enabled: bool
+    max_batch_size: int
+    max_wait_ms: float
+
+
+@dataclass(frozen=True)
+class InferenceExecutorConfig:
+    enabled: bool
+    kind: str
+    max_workers: int
+
+
+@dataclass(frozen=True)
+class PredictionCacheConfig:
+    enabled: bool
+    max_entries: int
+    ttl_seconds: float
+    feature_columns: list
+
+
+@dataclass(frozen=True)
+class ServingConfig:
+    host: str
+    port: int
+    workers: int
+    model_bundle_dir: Path
+    metrics_dir: Path
+
+
+@dataclass(frozen=True)
+class ModelRegistryConfig:
+    model_name: str
+    stage: str
+    cache_dir: Path
+
+
+@dataclass(frozen=True)
+class ModelReloadConfig:
+    poll_interval_seconds: float
+    admin_token_env: str
+    sync_interval_seconds: float
+
+
+@dataclass(frozen=True)
+class StreamingConfig:
+    chunk_size: int
+    max_line_bytes: int
+
+
+@dataclass(frozen=True)
+class ColumnarBatchConfig:
+    max_rows: int
+    max_body_bytes: int
+    numerical_features: list
+    categorical_features: list
+    integer_features: list
+    ranges: dict
+
+
+@dataclass(frozen=True)
+class ResponseEncodingConfig:
+    enabled: bool
+
+
+@dataclass(frozen=True)
+class AdmissionControlConfig:
+    enabled: bool
+    max_concurrent: int
+    max_queue: int
+    deadline_ms: float
+    status_code: int
+    retry_after_seconds: int
+
+
+@dataclass(frozen=True)
+class ModelCascadeConfig:
+    enabled: bool
+
+
+@dataclass(frozen=True)
+class ExplanationConfig:
+    enabled: bool
+    max_batch_size: int
+    top_k: int
+    cache: PredictionCacheConfig
+
+
+@dataclass(frozen=True)
+class ShadowConfig:
+    enabled: bool
+    challenger_stage: str
+    sample_rate: float
+    queue_size: int
+    max_batch_size: int
+
+
+@dataclass(frozen=True)
+class ThreadBudgetConfig:
+    enabled: bool
+    cores: int
+
+
+@dataclass(frozen=True)
+class ForestEngineConfig:
+    engine: str   # "compiled" | "sklearn"
+
+
+@dataclass(frozen=True)
+class RiskWindowConfig:
+    enabled: bool
+    bucket_seconds: int
+    windows_minutes: list
+    segments: list
+    max_segment_values: int
+    alert_color: str
+
+
+@dataclass(frozen=True)
+class AtRiskQueueConfig:
+    enabled: bool
+    capacity: int
+    min_churn_probability: float
+    segments: list
+    shared_dir: Path
+    sync_interval_seconds: float
+
+
+@dataclass(frozen=True)
+class DriftMonitorConfig:
+    enabled: bool
+    reference_path: Path
+    publish_interval_seconds: float
+    min_rows: int
+    decay: float
+
+
+@dataclass(frozen=True)
+class PredictionLogConfig:
+    enabled: bool
+    dir: Path
+    max_buffer_rows: int
+    flush_rows: int
+    flush_interval_seconds: float
+    retention_files: int
+    retention_days: float
+    compression: str
+    feature_columns: list
+
+
+@dataclass(frozen=True)
+class InferenceTimingConfig:
+    enabled: bool
+    server_timing_header: bool
@@ -1,23 +1,54 @@
+import dataclasses
 import joblib
+import hashlib
+import time
+from typing import Callable, Dict, List, Optional
 import numpy as np
 import pandas as pd
-import mlflow.sklearn
 from pathlib import Path
+from sklearn.pipeline import Pipeline
 from customerSatisfaction.config.configuration import ConfigurationManager
+from customerSatisfaction.components.compiled_forest import compile_forest
+from customerSatisfaction.components.compiled_transformer import compile_transformer
+from customerSatisfaction.components.decision_policy import DecisionPolicy
+from customerSatisfaction.components.model_cascade import CascadeClassifier
+from customerSatisfaction.components.model_cache import ModelCache
+from customerSatisfaction.components.thread_budget import intra_op_threads, limit_estimator
 from customerSatisfaction import logger
 
 class PredictionPipeline:
-    def __init__(self):
+    def __init__(self, stage: Optional[str] = None):
+        """
+        Args:
+            stage: Registry stage to load instead of model_registry.stage (e.g. a shadow
+                challenger in "Staging"); such a pipeline never falls back to the local model
+        """
         config_manager = ConfigurationManager()
+        features = config_manager.schema.inference_features
+        self.numerical_features = list(features.numerical)
+        self.categorical_features = list(features.categorical)
+        self.policy = DecisionPolicy(config_manager.get_decision_policy_config())
+        # Called with (rows scored, rows escalated to the champion) by cascade models
+        self.on_cascade: Optional[Callable[[int, int], None]] = None
+        # Called with ("frame" | "preprocess" | "classifier", seconds) for every scoring call
+        self.on_phase: Optional[Callable[[str, float], None]] = None
         
         try:
-            # 1. Connect to the Model Registry (DagsHub)
-            model_uri = "models:/Customer_Satisfaction_Model/Production"
-            self.model = mlflow.sklearn.load_model(model_uri)
-            logger.info("Successfully loaded Bundled Production model from DagsHub Registry")
+            # 1. Connect to the Model Registry (DagsHub), served from the local cache when possible
+            registry_config = config_manager.get_model_registry_config()
+            if stage is not None:
+                registry_config = dataclasses.replace(registry_config, stage=stage)
+            self.model, info = ModelCache(registry_config).load()
+            logger.info(f"Loaded Bundled {registry_config.stage} model v{info['version']} (source: {info['source']})")
             self.using_registry = True
+            self.model_version = f"{info['model_name']}/{info['version']}"
+            self.model_source = info["source"]
+            self.model_digest = info["digest"]
         except Exception as e:
             logger.error(f"Failed to load model from Registry: {e}")
+            if stage is not None:
+                # The local artifact is the champion, never a stand-in for another stage
+                raise
             self.using_registry = False
             
             # 2. Local Fallback
@@ -25,6 +56,148 @@ class PredictionPipeline:
             # Note: Ensure model_path points to the specific champion (e.g., CatBoost.joblib)
             self.model = joblib.load(model_training_config.model_path)
             self.transformer = joblib.load(Path('artifacts/feature_transformation/transformer.pkl'))
+            # Identify the local artifact by content so caches notice a retrain
+            with open(model_training_config.model_path, "rb") as f:
+                self.model_digest = hashlib.sha256(f.read()).hexdigest()
+            self.model_version = f"local:{Path(model_training_config.model_path).name}@{self.model_digest[:12]}"
+            self.model_source = "local"
+
+        cascade_config = config_manager.get_model_cascade_config()
+        forest_engine_config = config_manager.get_forest_engine_config()
+        # Settings that change what gets served from the same model version (part of the bundle key)
+        self.serving_settings = {
+            "model_cascade": dataclasses.asdict(cascade_config),
+            "forest_engine": dataclasses.asdict(forest_engine_config)
+        }
+        self._compile_fast_path()
+        self._configure_cascade(cascade_config.enabled)
+        self._select_forest_engine(forest_engine_config.engine)
+        self.limit_threads(intra_op_threads())
+
+    def limit_threads(self, threads: Optional[int]):
+        """Caps n_jobs / thread_count of every loaded estimator at the thread budget, if one is set."""
+        if not threads:
+            return
+        changed = limit_estimator(self.model, threads)
+        if not self.using_registry:
+            changed += limit_estimator(self.transformer, threads)
+        if changed:
+            logger.info(f"Limited {changed} estimators to {threads} threads per call")
+
+    def _configure_cascade(self, enabled: bool):
+        """Serves a registered cascade as-is, or only its champion when cascading is disabled."""
+        if not self.using_registry or not isinstance(getattr(self, "classifier", None), CascadeClassifier):
+            return
+        cascade = self.classifier
+        if enabled:
+            boundaries = ", ".join(f"{b:.2f}" for b in cascade.boundaries)
+            logger.info(
+                f"Cascade serving enabled: escalating P(Unsatisfied) within {cascade.half_width:.4f} of [{boundaries}]"
+            )
+            return
+        self.classifier = cascade.champion
+        self.model = Pipeline([self.model.steps[0], ("classifier", cascade.champion)])
+        logger.info("Cascade serving disabled, scoring every order with the champion")
+
+    def _select_forest_engine(self, engine: str):
+        """Swaps the fast-path classifier for its compiled forest when one matches predict_proba."""
+        if engine != "compiled" or self.compiled is None:
+            return
+        compiled = compile_forest(self.classifier)
+        if compiled is not None:
+            self.classifier = compiled
+
+    def _compile_fast_path(self):
+        """Splits off the classifier and compiles the preprocessor into flat NumPy arrays."""
+        self.compiled = None
+        if self.using_registry:
+            # Registry bundle is Pipeline([("preprocessor", ...), ("classifier", ...)])
+            if not isinstance(self.model, Pipeline) or len(self.model.steps) != 2:
+                logger.warning("Registry model is not a preprocessor + classifier Pipeline, fast path disabled")
+                return
+            preprocessor, self.classifier = self.model.steps[0][1], self.model.steps[1][1]
+        else:
+            preprocessor, self.classifier = self.transformer, self.model
+
+        self.compiled = compile_transformer(preprocessor)
+        if self.compiled is not None:
+            logger.info(f"Compiled transformer fast path enabled ({self.compiled.n_features_out} features)")
+
+    def _classify(self, features, classifier=None) -> np.ndarray:
+        """predict_proba of the classifier step (or `classifier`) on already-transformed features."""
+        classifier = self.classifier if classifier is None else classifier
+        if isinstance(classifier, CascadeClassifier):
+            probs, escalated = classifier.predict_proba_escalated(features)
+            on_cascade = getattr(self, "on_cascade", None)
+            if on_cascade is not None:
+                on_cascade(len(probs), escalated)
+            return probs
+        return classifier.predict_proba(features)
+
+    def _timed(self, phase: str, fn: Callable, *args):
+        """fn(*args), reported to on_phase when it is set."""
+        on_phase = getattr(self, "on_phase", None)
+        if on_phase is None:
+            return fn(*args)
+        start = time.perf_counter()
+        result = fn(*args)
+        on_phase(phase, time.perf_counter() - start)
+        return result
+
+    def feature_signature(self) -> List[str]:
+        """Raw input columns the loaded model was fitted on."""
+        if getattr(self, "feature_names", None) is not None:
+            # Array-only model bundle: recorded at export, the fitted model is not loaded
+            return list(self.feature_names)
+        source = self.model if self.using_registry else self.transformer
+        names = getattr(source, "feature_names_in_", None)
+        return list(names) if names is not None else self.numerical_features + self.categorical_features
+
+    def sample_records(self, n_rows: int = 8) -> List[dict]:
+        """Synthetic request records for warming up / sanity-checking a freshly loaded model."""
+        if self.compiled is not None:
+            # Probe rows built from the fitted means and known categories
+            probes = self.compiled.probe_records()
+        else:
+            probes = [{**{c: 0.0 for c in self.numerical_features}, **{c: "" for c in self.categorical_features}}]
+        return [probes[i % len(probes)] for i in range(n_rows)]
+
+    def predict_proba(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Scores a frame of raw features in a single vectorized call.
+
+        Args:
+            data: Raw features, one row per order
+        Returns:
+            Array of shape (n_rows, 2) with [P(Unsatisfied), P(Satisfied)] per row
+        """
+        if self.model is None:
+            # Array-only model bundle: the compiled fast path is all there is
+            return self.predict_records(data.to_dict(orient="records"))
+        if self.using_registry:
+            if not isinstance(self.model, Pipeline):
+                return self._timed("classifier", self.model.predict_proba, data)
+            # Registry model already bundles the preprocessor; run its steps apart to time them
+            preprocessor, classifier = self.model[:-1], self.model.steps[-1][1]
+        else:
+            preprocessor, classifier = self.transformer, self.model
+        features = self._timed("preprocess", preprocessor.transform, data)
+        return self._timed("classifier", self._classify, features, classifier)
+
+    def predict_records(self, records: List[dict]) -> np.ndarray:
+        """Same as predict_proba, for raw request records (e.g. CustomerData.model_dump())."""
+        if self.compiled is not None:
+            # Fast path: no DataFrame, no ColumnTransformer dispatch; the array is built while preprocessing
+            features = self._timed("preprocess", self.compiled.transform_records, records)
+            return self._timed("classifier", self._classify, features)
+        return self.predict_proba(self._timed("frame", pd.DataFrame, records))
+
+    def predict_columns(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """Same as predict_proba, for validated {feature: column} arrays (columnar batch requests)."""
+        if self.compiled is not None:
+            features = self._timed("preprocess", self.compiled.transform_columns, columns)
+            return self._timed("classifier", self._classify, features)
+        return self.predict_proba(self._timed("frame", pd.DataFrame, columns))
 
     def predict(self, data: pd.DataFrame):
         """
@@ -36,20 +209,11 @@ class PredictionPipeline:
             drop_cols = ["order_id", "customer_id", "product_id", "seller_id"]
             data_cleaned = data.drop(columns=[c for c in drop_cols if c in data.columns])
 
-            # CUSTOM THRESHOLD: Using 0.4 as established in Stage 6 Handshake
-            threshold = 0.4
-
-            if self.using_registry:
-                # self.model is a Pipeline (Transformer + Classifier)
-                # We use predict_proba to apply our specific 0.4 threshold
-                probabilities = self.model.predict_proba(data_cleaned)[:, 0]
-            else:
-                # Local fallback transformation
-                transformed_data = self.transformer.transform(data_cleaned)
-                probabilities = self.model.predict_proba(transformed_data)[:, 0]
+            # We use predict_proba to apply the Stage 6 threshold (params.yaml: decision_policy)
+            probabilities = self.predict_proba(data_cleaned)[:, 0]
             
             # Class 0 = Unsatisfied, Class 1 = Satisfied
-            prediction = np.where(probabilities >= threshold, 0, 1)
+            prediction = self.policy.classify(probabilities)
             
             return prediction
             
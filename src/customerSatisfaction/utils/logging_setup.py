@@ -0,0 +1,197 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, List, Optional
+
+# LogRecord attributes that are not `extra=` fields
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "suppressed"}
+
+DEFAULT_SETTINGS = {
+    "mode": "sync",
+    "format": "text",
+    "level": "INFO",
+    "queue_size": 10000,
+    "sampling": {"enabled": False, "burst": 10, "window_seconds": 1.0, "max_level": "WARNING"}
+}
+
+
+class CallSiteSampler(logging.Filter):
+    """
+    Keeps at most `burst` records per `window_seconds` from each call site
+    (file and line) at or below `max_level`, so one hot log line cannot flood
+    the output. The next record let through from a throttled call site
+    carries the number of records suppressed before it. ERROR and CRITICAL
+    are never sampled, whatever `max_level` says.
+    """
+
+    def __init__(self, burst: int, window_seconds: float, max_level: int):
+        super().__init__()
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self.max_level = min(max_level, logging.WARNING)
+        # (pathname, lineno) -> [window start, records in window, suppressed since last kept]
+        self._sites = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        now = time.monotonic()
+        site = self._sites.get((record.pathname, record.lineno))
+        if site is None:
+            site = self._sites[(record.pathname, record.lineno)] = [now, 0, 0]
+        if now - site[0] >= self.window_seconds:
+            site[0], site[1] = now, 0
+        site[1] += 1
+        if site[1] > self.burst:
+            site[2] += 1
+            return False
+        if site[2]:
+            record.suppressed, site[2] = site[2], 0
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    """The package's bracketed text format, noting suppressed records."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        suppressed = getattr(record, "suppressed", 0)
+        return f"{text} (+{suppressed} suppressed)" if suppressed else text
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: timestamp, level, module, message, any `extra=` fields and the traceback."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "module": record.module,
+            "message": record.getMessage()
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS})
+        if getattr(record, "suppressed", 0):
+            entry["suppressed"] = record.suppressed
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Never waits on a full queue: the record is dropped, counted and reported to `on_drop` instead."""
+
+    def __init__(self, queue_):
+        super().__init__(queue_)
+        self.dropped = 0
+        self.on_drop: Optional[Callable[[], None]] = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args on the caller (they may not outlive it) but keep the traceback
+        # separate from the message, so the listener's formatter places it
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # handle() holds the handler lock here, so the count is exact
+            self.dropped += 1
+            if self.on_drop is not None:
+                self.on_drop()
+
+
+class _Listener(QueueListener):
+    def stop(self):
+        # Safe to call twice (explicitly before exec, then again at exit)
+        if self._thread is not None:
+            super().stop()
+
+
+def _queue_handler() -> Optional[_DroppingQueueHandler]:
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, _DroppingQueueHandler):
+            return handler
+    return None
+
+
+def dropped_records() -> int:
+    """Records dropped so far because the queue was full (always 0 in sync mode)."""
+    handler = _queue_handler()
+    return handler.dropped if handler is not None else 0
+
+
+def on_dropped_record(callback: Callable[[], None]):
+    """Calls `callback` for every record dropped from now on (e.g. a metrics counter's inc)."""
+    handler = _queue_handler()
+    if handler is not None:
+        handler.on_drop = callback
+
+
+def configure_logging(
+    logger: logging.Logger,
+    handlers: List[logging.Handler],
+    text_format: str,
+    settings: Optional[dict] = None
+) -> Optional[QueueListener]:
+    """
+    Installs `handlers` on the root logger in the mode chosen by `settings`
+    (the `logging` block of config.yaml):
+
+    - sync: handlers write on the logging thread, as logging.basicConfig does
+    - queue: the root logger only enqueues records; a QueueListener thread runs
+      the handlers, so file and stdout I/O never blocks a request or stage
+
+    Returns:
+        The started listener in queue mode (stopped at exit), otherwise None
+    """
+    settings = {**DEFAULT_SETTINGS, **(settings or {})}
+    sampling = {**DEFAULT_SETTINGS["sampling"], **(settings.get("sampling") or {})}
+
+    formatter = JsonFormatter() if settings["format"] == "json" else TextFormatter(text_format)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    root.setLevel(settings["level"])
+    listener = None
+    if settings["mode"] == "queue":
+        queue_handler = _DroppingQueueHandler(queue.Queue(maxsize=int(settings["queue_size"])))
+        root.addHandler(queue_handler)
+
+        def start_listener() -> QueueListener:
+            started = _Listener(queue_handler.queue, *handlers, respect_handler_level=True)
+            started.start()
+            atexit.register(started.stop)
+            return started
+
+        def restart_in_child():
+            # A forked process (e.g. a process-pool inference worker) has no listener thread
+            queue_handler.queue = queue.Queue(maxsize=int(settings["queue_size"]))
+            start_listener()
+
+        listener = start_listener()
+        os.register_at_fork(after_in_child=restart_in_child)
+    else:
+        for handler in handlers:
+            root.addHandler(handler)
+
+    if sampling["enabled"]:
+        logger.addFilter(CallSiteSampler(
+            burst=int(sampling["burst"]),
+            window_seconds=float(sampling["window_seconds"]),
+            max_level=logging.getLevelName(sampling["max_level"])
+        ))
+    return listener